@@ -0,0 +1,234 @@
+# Build step for the image and style assets served from static/
+#
+#   python assets.py
+#
+# Logos are squared, re-encoded as WebP and written with content-hashed
+# names, so a URL never changes meaning and browsers can keep it forever.
+# style.css is minified the same way once per process. Gallery cards are
+# built ahead by build_cards (warmup.py calls it) and listed in the
+# manifest, so a new worker serves them without compositing anything.
+#
+# Streamlit serves static/ at /app/static/ (server.enableStaticServing in
+# .streamlit/config.toml). It only sends ETag/Last-Modified, so the proxy in
+# front of the app should add "Cache-Control: public, max-age=31536000,
+# immutable" for /app/static/logos/, /app/static/cards/ and /app/static/css/.
+import hashlib
+import io
+import json
+import os
+import re
+import textwrap
+import threading
+from functools import cache
+from pathlib import Path
+
+SOURCE_DIR = Path("logos")
+STATIC_DIR = Path("static")
+LOGO_DIR = STATIC_DIR / "logos"
+CARD_DIR = STATIC_DIR / "cards"
+CSS_DIR = STATIC_DIR / "css"
+STYLE_FILE = Path("style.css")
+MANIFEST_FILE = STATIC_DIR / "manifest.json"
+STATIC_URL = "/app/static"
+
+LOGO_SIZE = 300
+WEBP_QUALITY = 85
+
+_build_lock = threading.Lock()
+_manifest = None
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used in asset file names"""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def write_hashed(directory, stem, data: bytes, suffix="webp"):
+    """Write data under a content-hashed name and return its static path"""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{stem}.{content_hash(data)}.{suffix}"
+    if not path.exists():
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return path.relative_to(STATIC_DIR).as_posix()
+
+
+def encode_webp(image, quality=WEBP_QUALITY) -> bytes:
+    """Encode a PIL image as WebP bytes"""
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def square_logo(path):
+    """Fit a logo on a transparent LOGO_SIZE square"""
+    from PIL import Image
+
+    logo = Image.open(path).convert("RGBA")
+    logo.thumbnail((LOGO_SIZE, LOGO_SIZE))
+    canvas = Image.new("RGBA", (LOGO_SIZE, LOGO_SIZE), (0, 0, 0, 0))
+    canvas.paste(
+        logo, ((LOGO_SIZE - logo.width) // 2, (LOGO_SIZE - logo.height) // 2), logo
+    )
+    return canvas
+
+
+def build_logos():
+    """Re-encode every logo in logos/ and write the manifest"""
+    global _manifest
+
+    logos = {}
+    for path in sorted(SOURCE_DIR.iterdir()):
+        if path.suffix.lower() not in (".png", ".jpg", ".jpeg", ".webp"):
+            continue
+        logos[path.stem.lower()] = write_hashed(
+            LOGO_DIR, path.stem.lower(), encode_webp(square_logo(path))
+        )
+
+    # Drop files from earlier builds
+    current = {Path(name).name for name in logos.values()}
+    for path in LOGO_DIR.iterdir():
+        if path.name not in current:
+            path.unlink(missing_ok=True)
+
+    # Cards embed the logos, so new logos start without cards
+    manifest = {"logos": logos, "cards": {}}
+    _write_manifest(manifest)
+    _manifest = manifest
+    return manifest
+
+
+def build_cards(faculties):
+    """Composite every (acronym, full name) card and record it in the manifest"""
+    global _manifest
+
+    cards = {
+        acronym.lower(): {"name": full_name, "path": render_card(acronym, full_name)}
+        for acronym, full_name in faculties
+    }
+    # load_manifest takes _build_lock itself on first use
+    load_manifest()
+    with _build_lock:
+        manifest = {**_manifest, "cards": cards}
+        _write_manifest(manifest)
+        _manifest = manifest
+    return manifest
+
+
+def _write_manifest(manifest):
+    tmp_manifest = MANIFEST_FILE.with_suffix(".json.tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_manifest, MANIFEST_FILE)
+
+
+def load_manifest():
+    """Return the asset manifest, building the logos on first use"""
+    global _manifest
+
+    if _manifest is None:
+        with _build_lock:
+            if _manifest is None:
+                try:
+                    _manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    build_logos()
+    return _manifest
+
+
+def find_logo(faculty_acronym):
+    """Static path of a faculty logo, or None"""
+    logos = load_manifest()["logos"]
+    key = faculty_acronym.lower()
+    if key in logos:
+        return logos[key]
+    for stem, path in logos.items():
+        if key in stem:
+            return path
+    return None
+
+
+def static_url(path):
+    """URL of a file under static/"""
+    return f"{STATIC_URL}/{path}"
+
+
+def logo_url(faculty_acronym):
+    """URL of a faculty logo, or None"""
+    path = find_logo(faculty_acronym)
+    return static_url(path) if path else None
+
+
+def minify_css(css):
+    """Drop comments and the whitespace CSS does not need"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@cache
+def stylesheet_url():
+    """URL of the minified style.css, built once per process"""
+    css = minify_css(STYLE_FILE.read_text(encoding="utf-8"))
+    return static_url(write_hashed(CSS_DIR, "style", css.encode("utf-8"), "css"))
+
+
+@cache
+def card_url(faculty_acronym, full_name):
+    """URL of a faculty's gallery card, built by build_cards or on first use"""
+    card = load_manifest().get("cards", {}).get(faculty_acronym.lower())
+    if card and card["name"] == full_name and (STATIC_DIR / card["path"]).exists():
+        return static_url(card["path"])
+    return static_url(render_card(faculty_acronym, full_name))
+
+
+def render_card(faculty_acronym, full_name):
+    """Composite a gallery card (logo and full name); return its static path"""
+    from matplotlib import font_manager
+    from PIL import Image, ImageDraw, ImageFont
+
+    card = Image.new("RGB", (LOGO_SIZE, 380), "white")
+    draw = ImageDraw.Draw(card)
+    font_path = font_manager.findfont("DejaVu Sans")
+
+    logo_path = find_logo(faculty_acronym)
+    if logo_path:
+        logo = Image.open(STATIC_DIR / logo_path).convert("RGBA")
+        logo.thumbnail((260, 260))
+        card.paste(
+            logo, ((LOGO_SIZE - logo.width) // 2, (280 - logo.height) // 2), logo
+        )
+    else:
+        draw.text(
+            (LOGO_SIZE // 2, 140),
+            faculty_acronym,
+            fill="#333",
+            font=ImageFont.truetype(font_path, 44),
+            anchor="mm",
+        )
+
+    # Full name, wrapped under the logo
+    draw.multiline_text(
+        (LOGO_SIZE // 2, 330),
+        "\n".join(textwrap.wrap(full_name, 24)[:2]),
+        fill="#666",
+        font=ImageFont.truetype(font_path, 18),
+        anchor="mm",
+        align="center",
+    )
+
+    return write_hashed(
+        CARD_DIR, faculty_acronym.lower(), encode_webp(card, quality=80)
+    )
+
+
+if __name__ == "__main__":
+    manifest = build_logos()
+    original = sum(path.stat().st_size for path in SOURCE_DIR.iterdir())
+    built = sum(
+        (STATIC_DIR / path).stat().st_size for path in manifest["logos"].values()
+    )
+    print(f"✅ {len(manifest['logos'])} logos en {LOGO_DIR}")
+    print(f"   - {original / 1024:.0f} KB originales → {built / 1024:.0f} KB WebP")
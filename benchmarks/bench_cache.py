@@ -0,0 +1,138 @@
+# Worker restart: faculty pages in a fresh process, with and without the disk tier
+#
+#   python benchmarks/bench_cache.py
+#   python benchmarks/bench_cache.py --faculties MATCOM FF --repeat 3
+#
+# Each run is a new interpreter (as a restarted or second Streamlit worker
+# would be) that logs in and opens every faculty's performance tab, so all
+# of its aggregates and charts miss the in-memory cache. Runs go without
+# the disk tier, on an empty disk cache (which they fill) and on the filled
+# one. Afterwards the disk file is trimmed to half its size to check the
+# size limit. Exit code 1 if the warm runs computed anything, got no disk
+# hits, or the trim left the file over its limit.
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import APP, ROOT, percentile
+
+CHILD = f"""
+import json, os, sys, time
+os.chdir({str(ROOT)!r})
+sys.path.insert(0, {str(ROOT)!r})
+sys.path.insert(0, {str(ROOT / "benchmarks")!r})
+from streamlit.testing.v1 import AppTest
+from common import log_in
+import cache, cachedb, prefetch
+
+times = []
+for faculty in sys.argv[1:]:
+    started = time.perf_counter()
+    at = AppTest.from_file({str(APP)!r}, default_timeout=120)
+    at.query_params.update({{"page": "facultad", "f": faculty}})
+    log_in(at)
+    at.session_state.faculty_tab = "📈 Rendimiento"
+    at.run()
+    if at.exception:
+        sys.exit(at.exception[0].value)
+    times.append((time.perf_counter() - started) * 1000)
+prefetch._executor.submit(lambda: None).result()
+print(json.dumps({{"times": times, "memory": cache.stats(), "disk": cachedb.stats()}}))
+"""
+
+
+def worker(database, faculties):
+    """Open the faculties in a new interpreter; return its report"""
+    env = dict(
+        os.environ,
+        DASHBOARD_PERF_LOG="",
+        DASHBOARD_CACHE_DB=database,
+        DASHBOARD_USERS="",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, *faculties],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def disk_bytes(database):
+    """Total size of the values stored in a disk cache file"""
+    with sqlite3.connect(database) as connection:
+        return connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the disk cache tier")
+    parser.add_argument("--faculties", nargs="*", default=["MATCOM", "FF", "FLEX"])
+    parser.add_argument("--repeat", type=int, default=3, help="warm restarts")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    workdir = tempfile.mkdtemp(prefix="cachedb-")
+    database = str(Path(workdir) / "derived.sqlite3")
+
+    runs = [
+        ("sin disco", worker("", args.faculties)),
+        ("disco vacío", worker(database, args.faculties)),
+    ]
+    runs += [
+        ("disco lleno", worker(database, args.faculties)) for _ in range(args.repeat)
+    ]
+
+    print(f"{len(args.faculties)} facultades por proceso nuevo")
+    print(
+        f"{'modo':<14}{'p50 ms':>10}{'total ms':>10}{'cálculos':>10}"
+        f"{'disco ✓':>9}{'disco ✗':>9}"
+    )
+    for label, report in runs:
+        print(
+            f"{label:<14}{percentile(report['times'], 50):>10.0f}"
+            f"{sum(report['times']):>10.0f}{report['memory']['computed']:>10}"
+            f"{report['disk']['hits']:>9}{report['disk']['misses']:>9}"
+        )
+
+    failures = []
+    warm = [report for label, report in runs if label == "disco lleno"]
+    if any(report["memory"]["computed"] for report in warm):
+        failures.append("los procesos con disco lleno recalcularon valores")
+    if not all(report["disk"]["hits"] for report in warm):
+        failures.append("los procesos con disco lleno no leyeron del disco")
+
+    os.environ["DASHBOARD_CACHE_DB"] = database
+    import cachedb
+
+    size = disk_bytes(database)
+    started = time.perf_counter()
+    cachedb.trim(max_bytes=size // 2)
+    trimmed = disk_bytes(database)
+    print(
+        f"Recorte a {size // 2} bytes: {size} → {trimmed} bytes, "
+        f"{cachedb.stats()['evictions']} desalojos en "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms"
+    )
+    if trimmed > size // 2:
+        failures.append("el recorte dejó el disco por encima del límite")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"⚠️ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Cold-cache stampede: many sessions opening faculty pages at the same time
+#
+#   python benchmarks/bench_coalesce.py
+#   python benchmarks/bench_coalesce.py --sessions 200
+#
+# --sessions threads start together on an empty cache and each asks for its
+# faculty's rating aggregate and rating chart, built the way the dashboard
+# builds them. It runs twice: once through cache.get_or_compute (misses
+# are single-flight) and once with a plain lookup/compute/store, the
+# behaviour before coalescing. Reports how many computations ran, wall
+# time and per-session latency. Exit code 1 if the single-flight run
+# computed any key more than once.
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+
+from common import percentile, use_app
+
+
+def plain_get_or_compute(key, compute):
+    """Lookup, then compute and store on a miss, without coalescing"""
+    import cache
+
+    found, value = cache.lookup(key)
+    if found:
+        return value
+    value = compute()
+    cache.store(key, value)
+    return value
+
+
+def stampede(get_or_compute, sessions, faculties):
+    """Run the sessions; return (seconds, latencies ms, computations per key)"""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    import cache
+    import plots
+
+    cache.clear()
+    computed = Counter()
+    lock = threading.Lock()
+
+    def rating(faculty):
+        with lock:
+            computed[("rating", faculty)] += 1
+        frame = pd.read_csv("Semester_Rating.csv").set_index("Facultad")
+        return frame.loc[faculty].to_dict()
+
+    def chart(faculty):
+        with lock:
+            computed[("chart", faculty)] += 1
+        ratings = get_or_compute(("rating", faculty), lambda: rating(faculty))
+        with plots.figure_lock:
+            fig, _ = plots.rating_hist(pd.Series(ratings))
+            payload = plots.encode_png(fig)
+            plt.close(fig)
+        return payload
+
+    barrier = threading.Barrier(sessions)
+    latencies = []
+
+    def session(index):
+        faculty = faculties[index % len(faculties)]
+        barrier.wait()
+        started = time.perf_counter()
+        get_or_compute(("rating", faculty), lambda: rating(faculty))
+        get_or_compute(("chart", faculty), lambda: chart(faculty))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies, computed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-cache stampedes")
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    # Every mode starts cold: no disk tier to answer the misses
+    use_app()
+    import pandas as pd
+
+    import cache
+
+    faculties = [
+        f for f in pd.read_csv("Semester_Rating.csv")["Facultad"] if f != "GENERAL"
+    ]
+    keys = 2 * min(args.sessions, len(faculties))
+
+    failures = []
+    print(f"{args.sessions} sesiones, {keys} claves distintas")
+    print(f"{'modo':<18}{'cálculos':>10}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, get_or_compute in (
+        ("sin coalescencia", plain_get_or_compute),
+        ("single-flight", cache.get_or_compute),
+    ):
+        elapsed, latencies, computed = stampede(
+            get_or_compute, args.sessions, faculties
+        )
+        print(
+            f"{mode:<18}{sum(computed.values()):>10}{elapsed:>10.2f}"
+            f"{percentile(latencies, 50):>10.0f}{percentile(latencies, 95):>10.0f}"
+        )
+        if get_or_compute is cache.get_or_compute:
+            stats = cache.stats()
+            print(f"Cálculos duplicados evitados: {stats['coalesced']}")
+            repeated = [key for key, count in computed.items() if count > 1]
+            if repeated:
+                failures.append(f"{len(repeated)} claves calculadas más de una vez")
+
+    for failure in failures:
+        print(f"⚠️ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
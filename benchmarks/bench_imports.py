@@ -0,0 +1,110 @@
+# Cold start: from process start to the rendered login page
+#
+#   python benchmarks/bench_imports.py                    compare with baseline
+#   python benchmarks/bench_imports.py --update-baseline  store a new baseline
+#   python benchmarks/bench_imports.py --repeat 10 --top 20
+#
+# Every run is a fresh interpreter that renders the login page once through
+# AppTest (so streamlit's own testing imports are included). One extra run
+# under `python -X importtime` lists the slowest top-level imports, and says
+# which heavy modules the login page pulled in.
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from common import load_baseline, percentile, ratios, save_baseline
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline_imports.json"
+
+# Modules the login page should not need
+HEAVY = ("matplotlib", "pandas", "plots", "PIL", "st_clickable_images")
+
+CHILD = f"""
+import os, sys
+os.chdir({str(ROOT)!r})
+sys.path.insert(0, {str(ROOT)!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({str(ROOT / "main.py")!r}, default_timeout=120)
+at.run()
+if at.exception:
+    sys.exit(at.exception[0].value)
+print(",".join(m for m in {HEAVY!r} if m in sys.modules))
+"""
+
+
+def cold_start(extra_args=()):
+    """Run the login page in a new interpreter: (seconds, stdout, stderr)"""
+    env = dict(os.environ, DASHBOARD_PERF_LOG="")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *extra_args, "-c", CHILD],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return time.perf_counter() - started, result.stdout, result.stderr
+
+
+def top_imports(importtime_log, top):
+    """Slowest top-level imports as (module, cumulative ms)"""
+    imports = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented below their parent
+        if not name.startswith("  "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app cold start")
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts")
+    parser.add_argument("--top", type=int, default=15, help="imports to list")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    times = [cold_start()[0] * 1000 for _ in range(args.repeat)]
+    _, loaded, log = cold_start(["-X", "importtime"])
+
+    print(f"{'importación':<44}{'acumulado ms':>14}")
+    for name, cumulative in top_imports(log, args.top):
+        print(f"{name:<44}{cumulative:>14.1f}")
+    print(f"\nMódulos pesados cargados en el login: {loaded.strip() or 'ninguno'}")
+
+    results = {
+        "login_cold_start": {
+            "p50_ms": round(percentile(times, 50), 1),
+            "p95_ms": round(percentile(times, 95), 1),
+        }
+    }
+    stats = results["login_cold_start"]
+    verdict = ""
+    baseline = load_baseline(BASELINE_FILE)
+    regressed = False
+    if "login_cold_start" in baseline:
+        change = ratios(stats, baseline["login_cold_start"], ("p50_ms",))
+        verdict = f"   p50 x{change['p50_ms']:.2f} vs base"
+        regressed = change["p50_ms"] > 1 + args.tolerance
+        if regressed:
+            verdict += "  ⚠️ REGRESIÓN"
+    print(
+        f"Arranque hasta el login: p50 {stats['p50_ms']:.0f} ms, "
+        f"p95 {stats['p95_ms']:.0f} ms{verdict}"
+    )
+
+    if args.update_baseline:
+        save_baseline(BASELINE_FILE, results)
+    elif regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
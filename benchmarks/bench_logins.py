@@ -0,0 +1,150 @@
+# Login storm against the user directory
+#
+#   python users.py                                   build the roster first
+#   python benchmarks/bench_logins.py --logins 200 --concurrency 50
+#
+# --concurrency threads (one per simulated session) log in with accounts from
+# --users (default: initial_passwords.csv, else the demo accounts), all going
+# through users.authenticate and its bounded hashing pool. Meanwhile a probe
+# thread stands in for another session's rerun: a few ms of Python work
+# every 50 ms. Its latency during the storm vs. idle shows how much logins
+# slow everyone else down. A login rejected as busy (users.Busy) is retried
+# after a short pause, as a user would, and counted.
+import argparse
+import csv
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+from common import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_credentials(path):
+    """(username, password) pairs from a username,password CSV"""
+    with open(path, newline="", encoding="utf-8") as source:
+        return [(row["username"], row["password"]) for row in csv.DictReader(source)]
+
+
+def rerun_probe(stop, latencies):
+    """Fixed Python work every 50 ms, timing how long it takes"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        sum(i * i for i in range(20_000))
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.05)
+
+
+def probe(seconds):
+    """Probe latencies over an idle period"""
+    stop, latencies = threading.Event(), []
+    thread = threading.Thread(target=rerun_probe, args=(stop, latencies))
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join()
+    return latencies
+
+
+def storm(users, credentials, logins, concurrency):
+    """Run the logins: (seconds, latencies ms, failures, rejected, probe ms)"""
+    jobs = queue.Queue()
+    for index in range(logins):
+        jobs.put(credentials[index % len(credentials)])
+
+    latencies, failures, rejections = [], [], []
+
+    def session():
+        while True:
+            try:
+                username, password = jobs.get_nowait()
+            except queue.Empty:
+                return
+            started = time.perf_counter()
+            while True:
+                try:
+                    ok, _ = users.authenticate(username, password)
+                    break
+                except users.Busy:
+                    rejections.append(username)
+                    time.sleep(0.5)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                failures.append(username)
+
+    stop, probe_latencies = threading.Event(), []
+    prober = threading.Thread(target=rerun_probe, args=(stop, probe_latencies))
+    prober.start()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    prober.join()
+    return elapsed, latencies, failures, rejections, probe_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logins per second")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", help="CSV with username,password columns")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    import users
+
+    if args.users:
+        credentials = load_credentials(args.users)
+    elif Path(users.PASSWORDS_FILE).exists():
+        credentials = load_credentials(users.PASSWORDS_FILE)
+    else:
+        credentials = [
+            (name, user["password"]) for name, user in users.DEMO_USERS.items()
+        ]
+
+    started = time.perf_counter()
+    directory = users.load_directory()
+    print(
+        f"Directorio: {len(directory)} cuentas cargadas en "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+
+    idle = probe(1.0)
+    elapsed, latencies, failures, rejections, busy = storm(
+        users, credentials, args.logins, args.concurrency
+    )
+
+    print(
+        f"{args.logins} logins, {args.concurrency} sesiones, "
+        f"{users.HASH_WORKERS} hilos de hash: {args.logins / elapsed:.1f} logins/s"
+    )
+    print(
+        f"Latencia login: p50 {percentile(latencies, 50):.0f} ms, "
+        f"p95 {percentile(latencies, 95):.0f} ms"
+    )
+    print(
+        f"Rechazados por carga (reintentados): {len(rejections)}, "
+        f"máximo en cola {users.MAX_PENDING}"
+    )
+    print(
+        f"Rerun de otra sesión: p95 {percentile(idle, 95):.1f} ms en reposo, "
+        f"{percentile(busy, 95):.1f} ms durante los logins"
+    )
+    if failures:
+        print(f"⚠️ {len(failures)} logins fallidos, p. ej. {failures[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
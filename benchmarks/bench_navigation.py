@@ -0,0 +1,149 @@
+# Script runs and latency per navigation
+#
+#   python benchmarks/bench_navigation.py
+#   python benchmarks/bench_navigation.py --repeat 5
+#
+# Every navigation (sidebar page change, gallery card click, faculty
+# selector, back button, deep link) should cost exactly one script run: a
+# st.rerun() after a widget change first re-renders the old page for
+# nothing. Runs are counted with
+# profiling.run_count(); the exit code is 1 when any navigation takes more
+# than one run or lands on the wrong page.
+import argparse
+import json
+import sys
+import time
+
+from common import APP, log_in, percentile, use_app
+
+MAIN_PAGE = "📊 Dashboard Principal"
+FACULTY_PAGE = "🏛️ Dashboard Facultad"
+
+
+def new_session(query_params=None):
+    """A fresh headless session, optionally opened at a URL"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=120)
+    at.query_params.update(query_params or {})
+    return at
+
+
+def logged_in(page=MAIN_PAGE):
+    """A session logged in as admin, showing page"""
+    at = log_in(new_session())
+    if page != MAIN_PAGE:
+        at.sidebar.radio[0].set_value(page).run()
+    return at
+
+
+def click_gallery_card(at, index):
+    """Click a card of the faculty gallery and rerun
+
+    AppTest cannot drive custom components, so the click is sent the way
+    the browser sends it: as the component's new widget value.
+    """
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    gallery = next(
+        element
+        for element in at.get("component_instance")
+        if element.key == "faculty_gallery"
+    )
+    states = at._tree.get_widget_states()
+    states.widgets.append(
+        WidgetState(id=gallery.proto.id, json_value=json.dumps(index))
+    )
+    return at._run(states)
+
+
+def navigations(faculties):
+    """(name, setup, action, expected page, expected faculty)"""
+
+    def to_page(page):
+        return lambda at: at.sidebar.radio[0].set_value(page).run()
+
+    def to_faculty(faculty):
+        return lambda at: at.selectbox(key="faculty_selector").set_value(faculty).run()
+
+    def back(at):
+        next(b for b in at.button if b.label == "⬅️ Volver").click().run()
+
+    def deep_link(at):
+        at.run()
+
+    yield "sidebar", logged_in, to_page(FACULTY_PAGE), FACULTY_PAGE, None
+    card = len(faculties) // 2
+    yield (
+        "gallery_card",
+        logged_in,
+        lambda at: click_gallery_card(at, card),
+        FACULTY_PAGE,
+        faculties[card],
+    )
+    yield (
+        "faculty_selector",
+        lambda: logged_in(FACULTY_PAGE),
+        to_faculty("FF"),
+        FACULTY_PAGE,
+        "FF",
+    )
+    yield "back_button", lambda: logged_in(FACULTY_PAGE), back, MAIN_PAGE, None
+
+    def link_setup():
+        # The token of a real login, then a new session opened at the link
+        token = logged_in().query_params["s"]
+        return new_session({"s": token, "page": "facultad", "f": "FLEX"})
+
+    yield "deep_link", link_setup, deep_link, FACULTY_PAGE, "FLEX"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count reruns per navigation")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    use_app()
+    import pandas as pd
+
+    import profiling
+
+    # The gallery shows the faculties in this order
+    faculties = [
+        f for f in pd.read_csv("Semester_Rating.csv")["Facultad"] if f != "GENERAL"
+    ]
+
+    failures = []
+    print(f"{'navegación':<20}{'ejecuciones':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, setup, action, page, faculty in navigations(faculties):
+        times, runs = [], []
+        for _ in range(args.repeat):
+            at = setup()
+            before = profiling.run_count()
+            started = time.perf_counter()
+            action(at)
+            times.append((time.perf_counter() - started) * 1000)
+            runs.append(profiling.run_count() - before)
+
+            if at.exception:
+                failures.append(f"{name}: {at.exception[0].value}")
+            elif at.session_state.current_page != page or (
+                faculty and at.session_state.selected_faculty != faculty
+            ):
+                failures.append(f"{name}: terminó en {at.session_state.current_page}")
+
+        if max(runs) != 1:
+            failures.append(f"{name}: {max(runs)} ejecuciones por navegación")
+        print(
+            f"{name:<20}{max(runs):>12}{percentile(times, 50):>10.1f}"
+            f"{percentile(times, 95):>10.1f}"
+        )
+
+    for failure in failures:
+        print(f"⚠️ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
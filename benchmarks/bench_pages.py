@@ -0,0 +1,210 @@
+# Headless benchmarks for the dashboard pages (streamlit.testing AppTest)
+#
+#   python benchmarks/bench_pages.py                    compare with baseline
+#   python benchmarks/bench_pages.py --update-baseline  store a new baseline
+#   python benchmarks/bench_pages.py --repeat 10 --faculties MATCOM FF
+#
+# login_flow is a new session going from the login page through a student
+# login, i.e. the full rerun chain a new user pays; reload is a new session
+# that resumes from the session token in the URL. faculty:<F> shows
+# the default tab; faculty_careers/faculty_performance the other two.
+#
+# Each page is rerun --repeat times untraced for latency (p50/p95), then once
+# more under tracemalloc for peak memory. The exit code is 1 when a page's
+# p50 latency or peak memory regressed beyond --tolerance.
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import (
+    ADMIN,
+    APP,
+    STUDENT,
+    load_baseline,
+    log_in,
+    percentile,
+    ratios,
+    save_baseline,
+    use_app,
+)
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline_pages.json"
+
+
+def new_session():
+    """A fresh headless session of the app"""
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(str(APP), default_timeout=120)
+
+
+def check(at, page):
+    """Fail loudly if the script raised"""
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].value}")
+
+
+def login(credentials):
+    """A session logged in with the given credentials"""
+    at = log_in(new_session(), credentials)
+    check(at, "login")
+    return at
+
+
+def goto(at, page):
+    """Switch the session to a page"""
+    at.session_state.current_page = page
+    at.run()
+    check(at, page)
+
+
+def measure(name, setup, step, repeat):
+    """Time `step` over `repeat` runs, then trace one more for peak memory"""
+    at = setup()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        step(at)
+        times.append((time.perf_counter() - started) * 1000)
+        if at is not None:
+            check(at, name)
+
+    tracemalloc.start()
+    step(at)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(times, 50), 1),
+        "p95_ms": round(percentile(times, 95), 1),
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def scenarios(faculties):
+    """(name, setup, step) for every page and form"""
+
+    def rerun(at):
+        at.run()
+
+    def login_flow(_):
+        login(STUDENT)
+
+    def reload(logged_in):
+        at = new_session()
+        at.query_params["s"] = logged_in.query_params["s"]
+        at.run()
+        check(at, "reload")
+        if not at.session_state.logged_in:
+            raise RuntimeError("reload: session token was not accepted")
+
+    def on_page(page, credentials=ADMIN):
+        def setup():
+            at = login(credentials)
+            goto(at, page)
+            return at
+
+        return setup
+
+    def on_faculty(faculty):
+        def setup():
+            at = on_page("🏛️ Dashboard Facultad")()
+            at.selectbox(key="faculty_selector").set_value(faculty).run()
+            return at
+
+        return setup
+
+    def on_faculty_tab(faculty, tab):
+        def setup():
+            at = on_faculty(faculty)()
+            # Tabs are lazy: only the selected one is rendered
+            at.session_state.faculty_tab = tab
+            at.run()
+            check(at, tab)
+            return at
+
+        return setup
+
+    def submit(form_button_label):
+        def step(at):
+            next(b for b in at.button if b.label == form_button_label).click().run()
+
+        return step
+
+    yield "login", new_session, rerun
+    yield "login_flow", lambda: None, login_flow
+    yield "reload", lambda: login(STUDENT), reload
+    yield "main", on_page("📊 Dashboard Principal"), rerun
+    for faculty in faculties:
+        yield f"faculty:{faculty}", on_faculty(faculty), rerun
+    for tab, label in (("careers", "🎓 Carreras"), ("performance", "📈 Rendimiento")):
+        yield (
+            f"faculty_{tab}:{faculties[0]}",
+            on_faculty_tab(faculties[0], label),
+            rerun,
+        )
+    yield "semester_eval", on_page("⭐ Evaluar Semestre", STUDENT), rerun
+    yield (
+        "semester_eval_submit",
+        on_page("⭐ Evaluar Semestre", STUDENT),
+        submit("📤 Enviar Evaluación"),
+    )
+    yield "class_eval", on_page("📚 Evaluar Clase", STUDENT), rerun
+    yield (
+        "class_eval_submit",
+        on_page("📚 Evaluar Clase", STUDENT),
+        submit("📤 Enviar Evaluación"),
+    )
+    yield "comments", on_page("💬 Comentarios"), rerun
+
+
+def compare(results, baseline, tolerance):
+    """Print a report and return the pages that regressed"""
+    regressions = []
+    print(f"{'página':<28}{'p50 ms':>10}{'p95 ms':>10}{'pico KB':>10}   vs base")
+    for name, stats in results.items():
+        verdict = ""
+        if name in baseline:
+            change = ratios(stats, baseline[name], ("p50_ms", "peak_kb"))
+            verdict = f"p50 x{change['p50_ms']:.2f}, pico x{change['peak_kb']:.2f}"
+            if max(change.values()) > 1 + tolerance:
+                regressions.append(name)
+                verdict += "  ⚠️ REGRESIÓN"
+        print(
+            f"{name:<28}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['peak_kb']:>10}   {verdict}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pages")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per page")
+    parser.add_argument("--faculties", nargs="*", help="faculties (default: all)")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    use_app()
+    import pandas as pd
+
+    faculties = args.faculties or [
+        f for f in pd.read_csv("Semester_Rating.csv")["Facultad"] if f != "GENERAL"
+    ]
+
+    results = {}
+    for name, setup, step in scenarios(faculties):
+        results[name] = measure(name, setup, step, args.repeat)
+
+    regressions = compare(results, load_baseline(BASELINE_FILE), args.tolerance)
+
+    if args.update_baseline:
+        save_baseline(BASELINE_FILE, results)
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Micro-benchmarks for the plots.py chart builders
+#
+#   python benchmarks/bench_plots.py                    compare with baseline
+#   python benchmarks/bench_plots.py --update-baseline  store a new baseline
+#   python benchmarks/bench_plots.py --sizes 5 50 500 --repeat 5
+#
+# Every builder is timed per phase: build (the plots.* call), layout
+# (draw_without_rendering) and encode (PNG and minified SVG). Builders that
+# take categories run at each input size. Medians are compared with
+# baseline_plots.json and the exit code is 1 past --tolerance.
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from common import load_baseline, percentile, ratios, save_baseline
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline_plots.json"
+
+PHASES = ("build_ms", "layout_ms", "png_ms", "svg_ms")
+
+
+def make_inputs(n):
+    """Synthetic inputs with n categories for every builder"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(n)
+    categories = [f"Categoría {i}" for i in range(n)]
+    return {
+        "ratings": pd.Series(rng.uniform(1, 10, n), index=categories),
+        "faculties": pd.DataFrame(
+            rng.uniform(1, 10, (n, 6)),
+            index=[f"FAC{i}" for i in range(n)],
+            columns=[f"Criterio {i}" for i in range(6)],
+        ),
+        "grades": {
+            str(i): int(count) for i, count in enumerate(rng.integers(1, 50, n))
+        },
+        "enrollment": {
+            f"B{i}": int(count) for i, count in enumerate(rng.integers(10, 120, n))
+        },
+    }
+
+
+def builders():
+    """name -> (takes categories, build function)"""
+    import plots
+
+    return {
+        "color_legend": (False, lambda inputs: plots.color_legend()),
+        "rating_pie": (False, lambda inputs: plots.rating_pie(6.4)),
+        "rating_hist": (True, lambda inputs: plots.rating_hist(inputs["ratings"])),
+        "fac_avrg": (True, lambda inputs: plots.fac_avrg(inputs["faculties"])),
+        "mark_hist": (True, lambda inputs: plots.mark_hist(inputs["grades"])),
+        "matr_pie": (True, lambda inputs: plots.matr_pie(inputs["enrollment"])),
+    }
+
+
+def measure(build, inputs, repeat):
+    """Median time per phase plus encoded sizes"""
+    import matplotlib.pyplot as plt
+
+    import plots
+
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fig, _ = build(inputs)
+        built = time.perf_counter()
+        fig.draw_without_rendering()
+        laid_out = time.perf_counter()
+        png = plots.encode_png(fig)
+        png_done = time.perf_counter()
+        svg = plots.encode_svg(fig)
+        svg_done = time.perf_counter()
+        plt.close(fig)
+
+        timings["build_ms"].append(built - started)
+        timings["layout_ms"].append(laid_out - built)
+        timings["png_ms"].append(png_done - laid_out)
+        timings["svg_ms"].append(svg_done - png_done)
+
+    stats = {
+        phase: round(percentile(values, 50) * 1000, 1)
+        for phase, values in timings.items()
+    }
+    stats["png_kb"] = round(len(png) / 1024, 1)
+    stats["svg_kb"] = round(len(svg.encode("utf-8")) / 1024, 1)
+    return stats
+
+
+def compare(results, baseline, tolerance):
+    """Print a report and return the charts that regressed"""
+    regressions = []
+    header = "".join(f"{phase[:-3]:>9}" for phase in PHASES)
+    print(f"{'gráfico':<20}{header}{'png KB':>9}{'svg KB':>9}   peor vs base")
+    for name, stats in results.items():
+        verdict = ""
+        if name in baseline:
+            change = ratios(stats, baseline[name], PHASES)
+            worst = max(change, key=change.get)
+            verdict = f"{worst[:-3]} x{change[worst]:.2f}"
+            if change[worst] > 1 + tolerance:
+                regressions.append(name)
+                verdict += "  ⚠️ REGRESIÓN"
+        timings = "".join(f"{stats[phase]:>9.1f}" for phase in PHASES)
+        print(
+            f"{name:<20}{timings}{stats['png_kb']:>9.1f}{stats['svg_kb']:>9.1f}"
+            f"   {verdict}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plots.py builders")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    results = {}
+    for name, (sized, build) in builders().items():
+        for n in args.sizes if sized else [1]:
+            label = f"{name}@{n}" if sized else name
+            results[label] = measure(build, make_inputs(n), args.repeat)
+
+    regressions = compare(results, load_baseline(BASELINE_FILE), args.tolerance)
+
+    if args.update_baseline:
+        save_baseline(BASELINE_FILE, results)
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# First rerun after a data update, with and without stale-while-revalidate
+#
+#   python benchmarks/bench_refresh.py
+#   python benchmarks/bench_refresh.py --updates 5 --faculty FF
+#
+# Runs the app on copies of the data files in a temporary directory. A
+# session sits on a faculty's performance tab with a warm cache; then
+# Semester_Rating.csv changes, the reloader swaps the datasets in, and the
+# session's next rerun is timed. With the default grace period that rerun
+# is answered from the previous version while the worker recomputes; with
+# no grace period it computes the new version itself. Both are measured.
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from common import APP, ROOT, log_in, percentile, use_app
+
+FILES = (
+    "Semester_Rating.csv",
+    "MATCOM_Rating.csv",
+    "MATCOM_Classes.csv",
+    "VD_Rating.csv",
+    "Student_Ratings.csv",
+    "faculties.json",
+    "style.css",
+)
+DIRECTORIES = ("logos",)
+
+
+def faculty_session(faculty):
+    """A logged-in session on the faculty's performance tab"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=120)
+    at.query_params.update({"page": "facultad", "f": faculty})
+    log_in(at)
+    at.session_state.faculty_tab = "📈 Rendimiento"
+    at.run()
+    return at
+
+
+def update_data(value):
+    """Rewrite Semester_Rating.csv and wait until the new version is served"""
+    import pandas as pd
+
+    import registry
+    import reloader
+
+    swapped = reloader.stats()[registry.DATASETS][0]
+    frame = pd.read_csv("Semester_Rating.csv")
+    frame.iloc[:, 1] = value
+    frame.to_csv("Semester_Rating.csv.tmp", index=False)
+    os.replace("Semester_Rating.csv.tmp", "Semester_Rating.csv")
+    while reloader.stats()[registry.DATASETS][0] == swapped:
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark refresh after updates")
+    parser.add_argument("--updates", type=int, default=3)
+    parser.add_argument("--faculty", default="MATCOM")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="refresh-")
+    for path in FILES:
+        shutil.copy(ROOT / path, workdir)
+    for path in DIRECTORIES:
+        shutil.copytree(ROOT / path, Path(workdir) / path)
+    use_app(workdir)
+
+    import cache
+    import prefetch
+
+    grace = cache.MAX_STALE_SECONDS
+    results = {}
+    try:
+        for label, max_stale in (("sin gracia", 0), (f"gracia {grace:.0f} s", grace)):
+            cache.MAX_STALE_SECONDS = max_stale
+            at = faculty_session(args.faculty)
+            times = []
+            for update in range(args.updates):
+                # Let prefetch finish so the cache is warm before the change
+                prefetch._executor.submit(lambda: None).result()
+                update_data(5.0 + len(results) + update / 10)
+                started = time.perf_counter()
+                at.run()
+                times.append((time.perf_counter() - started) * 1000)
+                if at.exception:
+                    raise RuntimeError(at.exception[0].value)
+            results[label] = times
+    finally:
+        cache.MAX_STALE_SECONDS = grace
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"Primera ejecución tras {args.updates} actualizaciones ({args.faculty}):")
+    for label, times in results.items():
+        print(
+            f"  {label:<16} p50 {percentile(times, 50):>7.0f} ms"
+            f"   máx {max(times):>7.0f} ms"
+        )
+    print(f"Respuestas obsoletas servidas: {cache.stats()['stale']}")
+
+
+if __name__ == "__main__":
+    main()
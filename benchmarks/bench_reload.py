@@ -0,0 +1,134 @@
+# Hot reload of the datasets: how fast a new file is served, and what it
+# costs the sessions reading meanwhile
+#
+#   python benchmarks/bench_reload.py
+#   python benchmarks/bench_reload.py --reloads 10
+#
+# Works on copies of the data files in a temporary directory. Each round
+# rewrites Semester_Rating.csv with one changed value and measures the time
+# until registry.get returns the new version, while a reader thread keeps
+# calling registry.get (its p95 shows whether readers ever wait on a
+# reload). A run pinned before the change must keep seeing the old version,
+# and a broken file must be rejected. The exit code is 1 if either fails.
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_FILES = (
+    "Semester_Rating.csv",
+    "MATCOM_Rating.csv",
+    "MATCOM_Classes.csv",
+    "VD_Rating.csv",
+)
+
+
+def read_data():
+    import pandas as pd
+
+    return {path: pd.read_csv(path) for path in DATA_FILES}
+
+
+def validate(data):
+    if "Facultad" not in data["Semester_Rating.csv"].columns:
+        raise ValueError("Semester_Rating.csv: falta la columna Facultad")
+
+
+def marker(registry):
+    return registry.get(registry.DATASETS, read_data)["Semester_Rating.csv"].iloc[0, 1]
+
+
+def rewrite(value):
+    """Replace Semester_Rating.csv atomically, with value in its first cell"""
+    import pandas as pd
+
+    frame = pd.read_csv("Semester_Rating.csv")
+    frame.iloc[0, 1] = value
+    frame.to_csv("Semester_Rating.csv.tmp", index=False)
+    os.replace("Semester_Rating.csv.tmp", "Semester_Rating.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset hot reload")
+    parser.add_argument("--reloads", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    workdir = tempfile.mkdtemp(prefix="reload-")
+    for path in DATA_FILES:
+        shutil.copy(ROOT / path, workdir)
+    os.chdir(workdir)
+
+    import registry
+    import reloader
+
+    reloader.watch(registry.DATASETS, DATA_FILES, read_data, validate=validate)
+    marker(registry)
+
+    stop, reads = threading.Event(), []
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            marker(registry)
+            reads.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    failures, delays = [], []
+    for round_ in range(args.reloads):
+        value = 1.0 + round_ / 10
+        reloads = reloader.stats()[registry.DATASETS][0]
+        with registry.pinned():
+            before = marker(registry)
+            rewrite(value)
+            started = time.perf_counter()
+            while reloader.stats()[registry.DATASETS][0] == reloads:
+                if time.perf_counter() - started > 60:
+                    failures.append(f"la versión {value} no llegó en 60 s")
+                    break
+                time.sleep(0.005)
+            delays.append((time.perf_counter() - started) * 1000)
+            if marker(registry) != before:
+                failures.append("una ejecución fijada vio la versión nueva")
+        if marker(registry) != value:
+            failures.append(f"se sirve {marker(registry)} en vez de {value}")
+
+    # A file missing its key column must not be served
+    swapped_before = reloader.stats()[registry.DATASETS][0]
+    with open("Semester_Rating.csv", "w", encoding="utf-8") as broken:
+        broken.write("x,y\n1,2\n")
+    time.sleep(reloader.SETTLE_SECONDS + reloader.POLL_SECONDS + 1)
+    if reloader.stats()[registry.DATASETS][0] != swapped_before:
+        failures.append("se sirvió un archivo inválido")
+
+    stop.set()
+    thread.join()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print(
+        f"{args.reloads} recargas: visibles tras p50 {percentile(delays, 50):.0f} ms, "
+        f"p95 {percentile(delays, 95):.0f} ms"
+    )
+    print(
+        f"Lecturas durante las recargas: {len(reads)}, "
+        f"p95 {percentile(reads, 95):.3f} ms, máx {max(reads):.1f} ms"
+    )
+    print(f"Recargas, fallidas: {reloader.stats()[registry.DATASETS]}")
+    for failure in failures:
+        print(f"⚠️ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Per-session memory of the dashboard
+#
+#   python benchmarks/bench_session.py --sessions 20
+#
+# Reports two numbers for a logged-in student session:
+#   - state KB: deep size of what the session keeps in st.session_state,
+#     skipping objects owned by the shared registry
+#   - growth KB: traced memory added per extra session (AppTest overhead
+#     included, so compare runs against each other, not absolutes)
+import argparse
+import sys
+import tracemalloc
+
+from common import APP, STUDENT, log_in, use_app
+
+
+def deep_size(value, seen):
+    """Approximate bytes reachable from value, counting each object once"""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    import pandas as pd
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    size = sys.getsizeof(value)
+    if isinstance(value, dict) or hasattr(value, "items"):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    return size
+
+
+def session_state_size(at):
+    """Deep size of a session's state, excluding shared registry objects"""
+    import registry
+
+    # Walking the shared values first marks everything they reach as seen
+    seen = set()
+    for value in registry.shared_values():
+        deep_size(value, seen)
+    state = at.session_state
+    return sum(deep_size(state[key], seen) for key in state)
+
+
+def logged_in_session():
+    from streamlit.testing.v1 import AppTest
+
+    at = log_in(AppTest.from_file(str(APP), default_timeout=120), STUDENT)
+    at.session_state.current_page = "💬 Comentarios"
+    at.run()
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-session memory")
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    use_app()
+
+    # The first session pays for imports and shared data
+    first = logged_in_session()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [logged_in_session() for _ in range(args.sessions)]
+    growth = (tracemalloc.get_traced_memory()[0] - before) / args.sessions
+    tracemalloc.stop()
+
+    print(f"state KB por sesión:  {session_state_size(first) / 1024:,.1f}")
+    print(f"growth KB por sesión: {growth / 1024:,.1f} ({len(sessions)} sesiones)")
+
+
+if __name__ == "__main__":
+    main()
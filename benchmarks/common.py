@@ -0,0 +1,66 @@
+# Helpers shared by the benchmark scripts
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "main.py"
+
+ADMIN = ("admin", "admin123")
+STUDENT = ("estudiante1", "1234")
+
+
+def use_app(workdir=ROOT):
+    """Set up this process to import and run the app from workdir
+
+    The app reads its files relative to the working directory. Sessions log
+    in with the demo accounts whether or not a roster was built, and start
+    without a perf log or whatever earlier runs left in the disk cache.
+    """
+    sys.path.insert(0, str(ROOT))
+    os.environ["DASHBOARD_PERF_LOG"] = ""
+    os.environ["DASHBOARD_USERS"] = ""
+    os.environ["DASHBOARD_CACHE_DB"] = ""
+    os.chdir(workdir)
+
+
+def log_in(at, credentials=ADMIN):
+    """Run a new AppTest session through the login form and return it"""
+    at.run()
+    at.text_input[0].input(credentials[0])
+    at.text_input[1].input(credentials[1])
+    at.button[0].click().run()
+    return at
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def load_baseline(path):
+    """Stored results, or an empty baseline"""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path, results):
+    """Store results as the new baseline"""
+    path.write_text(
+        json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+    print(f"Línea base guardada en {path.name}")
+
+
+def ratios(stats, base, metrics):
+    """Current / baseline ratio for each metric present in both"""
+    return {
+        metric: stats[metric] / max(base[metric], 0.1)
+        for metric in metrics
+        if metric in stats and metric in base
+    }
@@ -0,0 +1,362 @@
+# Load generator: many concurrent students against a running dashboard
+#
+#   streamlit run main.py --server.headless true &
+#   python benchmarks/loadgen.py --sessions 500 --ramp 60 --duration 300
+#
+# Every simulated student opens its own websocket session, logs in, then
+# moves between pages and submits both evaluation forms with random think
+# times, speaking the same protobuf protocol as the browser. The report
+# has throughput and latency percentiles per action plus a timeline of the
+# server's CPU and memory, read from /proc (--pid, or found by port).
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from common import percentile
+
+# Weighted page mix for the end-of-term rush
+ACTIONS = {
+    "semester_eval": 4,
+    "class_eval": 4,
+    "main": 2,
+    "faculty": 2,
+    "comments": 1,
+}
+
+PAGES = {
+    "main": "📊 Dashboard Principal",
+    "faculty": "🏛️ Dashboard Facultad",
+    "semester_eval": "⭐ Evaluar Semestre",
+    "class_eval": "📚 Evaluar Clase",
+    "comments": "💬 Comentarios",
+}
+
+DEMO_USERS = [("estudiante1", "1234"), ("estudiante2", "1234")]
+
+
+class ScriptError(Exception):
+    """The app raised while serving a simulated student"""
+
+
+class StudentSession:
+    """One browser-like websocket session"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}
+        self.elements = []
+        # widget id -> fragment id, for widgets drawn inside st.fragment
+        self.fragments = {}
+
+    async def rerun(self, changes=()):
+        """Send widget changes and wait for the script run(s) to finish"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        # Trigger values are one-shot, everything else is resent every run
+        triggers = []
+        for state in changes:
+            if state.WhichOneof("value") == "trigger_value":
+                triggers.append(state)
+            else:
+                self.widgets[state.id] = state
+        msg.rerun_script.widget_states.widgets.extend(
+            list(self.widgets.values()) + triggers
+        )
+        # Like the browser, a change inside a fragment reruns only that fragment
+        fragment_ids = {self.fragments.get(state.id) for state in changes} - {None}
+        if len(fragment_ids) == 1:
+            msg.rerun_script.fragment_id = fragment_ids.pop()
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        elements, error = [], None
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                elements = []
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                proto = getattr(element, element.WhichOneof("type"))
+                if element.WhichOneof("type") == "exception":
+                    error = element.exception.message
+                elif forward.delta.fragment_id and hasattr(proto, "id"):
+                    self.fragments[proto.id] = forward.delta.fragment_id
+                elements.append(element)
+            elif kind == "script_finished":
+                status = forward.script_finished
+                if status == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                    # Only the fragment was redrawn; the rest of the page stays
+                    elements = elements + self.elements
+                if status != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+                elements = []
+        self.elements = elements
+
+        # The browser forgets widgets that are no longer drawn; resending a
+        # stale value (e.g. the radio of the previous page) would make the
+        # app navigate back and forth forever
+        drawn = {
+            getattr(element, element.WhichOneof("type")).id
+            for element in elements
+            if hasattr(getattr(element, element.WhichOneof("type")), "id")
+        }
+        self.widgets = {
+            id_: state for id_, state in self.widgets.items() if id_ in drawn
+        }
+        if error:
+            raise ScriptError(error)
+        return time.perf_counter() - started
+
+    def widget(self, kind, label):
+        """Find a widget in the last run by type and label"""
+        for element in self.elements:
+            if element.WhichOneof("type") == kind:
+                proto = getattr(element, kind)
+                if proto.label == label:
+                    return proto
+        raise ScriptError(f"{kind} '{label}' no encontrado")
+
+    @staticmethod
+    def state(widget_id, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        for field, content in value.items():
+            if field == "double_array_value":
+                state.double_array_value.data.extend(content)
+            else:
+                setattr(state, field, content)
+        return state
+
+    async def login(self, username, password):
+        await self.rerun()
+        return await self.rerun(
+            [
+                self.state(
+                    self.widget("text_input", "Usuario").id, string_value=username
+                ),
+                self.state(
+                    self.widget("text_input", "Contraseña").id, string_value=password
+                ),
+                self.state(
+                    self.widget("button", "Iniciar Sesión").id, trigger_value=True
+                ),
+            ]
+        )
+
+    async def goto(self, page):
+        radio = self.widget("radio", "Seleccionar página:")
+        return await self.rerun([self.state(radio.id, string_value=page)])
+
+    async def submit_form(self):
+        """Move every slider on the page and press the form's submit button"""
+        changes = [
+            self.state(element.slider.id, double_array_value=[random.randint(1, 10)])
+            for element in self.elements
+            if element.WhichOneof("type") == "slider"
+        ]
+        submit = self.widget("button", "📤 Enviar Evaluación")
+        changes.append(self.state(submit.id, trigger_value=True))
+        return await self.rerun(changes)
+
+    async def pick_faculty(self):
+        selectbox = self.widget("selectbox", "Selecciona una facultad")
+        faculty = random.choice(list(selectbox.options))
+        return await self.rerun([self.state(selectbox.id, string_value=faculty)])
+
+
+async def student(index, args, users, records, active):
+    """Run one simulated student until the deadline"""
+    import websockets
+
+    await asyncio.sleep(args.ramp * index / max(args.sessions, 1))
+    username, password = users[index % len(users)]
+
+    def record(action, latency, ok):
+        records.append((time.time(), action, latency, ok))
+
+    try:
+        async with websockets.connect(
+            args.url.rstrip("/") + "/_stcore/stream",
+            subprotocols=["streamlit"],
+            max_size=None,
+            open_timeout=60,
+        ) as ws:
+            active[0] += 1
+            try:
+                session = StudentSession(ws)
+                record("login", await session.login(username, password), True)
+
+                while time.time() < args.deadline:
+                    await asyncio.sleep(random.expovariate(1 / args.think))
+                    action = random.choices(list(ACTIONS), weights=ACTIONS.values())
+                    action = action[0]
+                    try:
+                        latency = await session.goto(PAGES[action])
+                        if action in ("semester_eval", "class_eval"):
+                            latency += await session.submit_form()
+                        elif action == "faculty":
+                            latency += await session.pick_faculty()
+                        record(action, latency, True)
+                    except ScriptError:
+                        record(action, 0.0, False)
+            finally:
+                active[0] -= 1
+    except Exception as error:
+        record("connect", 0.0, False)
+        if args.verbose:
+            print(f"sesión {index}: {error!r}", file=sys.stderr)
+
+
+def find_server_pid(port):
+    """PID of the streamlit server on a port, via /proc (largest RSS wins)"""
+    candidates = []
+    for proc in Path("/proc").iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            argv = (proc / "cmdline").read_bytes().decode().split("\0")
+            if "streamlit" not in " ".join(argv) or "run" not in argv:
+                continue
+            if f"--server.port={port}" not in argv and not (
+                "--server.port" in argv
+                and argv[argv.index("--server.port") + 1] == str(port)
+            ):
+                if port != 8501 or any(a.startswith("--server.port") for a in argv):
+                    continue
+            candidates.append((read_usage(int(proc.name))[1], int(proc.name)))
+        except (OSError, IndexError):
+            continue
+    return max(candidates)[1] if candidates else None
+
+
+def read_usage(pid):
+    """(CPU seconds, resident MB) of a process"""
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    rss_pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    return cpu, rss_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+async def monitor(args, records, active, timeline):
+    """Sample throughput and server usage every --interval seconds"""
+    last_cpu, last_time, last_count = None, time.time(), 0
+    if args.pid:
+        last_cpu = read_usage(args.pid)[0]
+
+    print(f"{'t (s)':>6}{'sesiones':>10}{'acc/s':>8}{'CPU %':>8}{'RSS MB':>9}")
+    while time.time() < args.deadline + args.think * 2:
+        await asyncio.sleep(args.interval)
+        now = time.time()
+        sample = {
+            "t": round(now - args.started, 1),
+            "sessions": active[0],
+            "actions_per_s": round((len(records) - last_count) / (now - last_time), 1),
+        }
+        if args.pid:
+            cpu, rss = read_usage(args.pid)
+            sample["cpu_pct"] = round((cpu - last_cpu) / (now - last_time) * 100, 1)
+            sample["rss_mb"] = round(rss, 1)
+            last_cpu = cpu
+        last_time, last_count = now, len(records)
+        timeline.append(sample)
+        print(
+            f"{sample['t']:>6.0f}{sample['sessions']:>10}"
+            f"{sample['actions_per_s']:>8.1f}"
+            f"{sample.get('cpu_pct', float('nan')):>8.1f}"
+            f"{sample.get('rss_mb', float('nan')):>9.1f}"
+        )
+
+
+def summarize(records, elapsed):
+    """Per-action count, errors and latency percentiles"""
+    summary = {}
+    for action in sorted({r[1] for r in records}):
+        latencies = [r[2] * 1000 for r in records if r[1] == action and r[3]]
+        errors = sum(1 for r in records if r[1] == action and not r[3])
+        summary[action] = {
+            "count": len(latencies),
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+        }
+    ok = sum(1 for r in records if r[3])
+    summary["total"] = {"count": ok, "throughput_per_s": round(ok / elapsed, 2)}
+    return summary
+
+
+def load_users(path):
+    """(username, password) pairs from a CSV with those two columns"""
+    with open(path, newline="", encoding="utf-8") as source:
+        return [(row["username"], row["password"]) for row in csv.DictReader(source)]
+
+
+async def run(args):
+    users = load_users(args.users) if args.users else DEMO_USERS
+    records, active, timeline = [], [0], []
+    args.started = time.time()
+    args.deadline = args.started + args.duration
+
+    tasks = [student(i, args, users, records, active) for i in range(args.sessions)]
+    await asyncio.gather(monitor(args, records, active, timeline), *tasks)
+    return summarize(records, time.time() - args.started), timeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent students")
+    parser.add_argument("--url", default="ws://localhost:8501")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--ramp", type=float, default=30.0, help="seconds to start all")
+    parser.add_argument("--duration", type=float, default=120.0)
+    parser.add_argument("--think", type=float, default=5.0, help="mean think time")
+    parser.add_argument("--interval", type=float, default=5.0, help="sample period")
+    parser.add_argument("--users", help="CSV with username,password columns")
+    parser.add_argument("--pid", type=int, help="server PID (default: by port)")
+    parser.add_argument("--output", help="write summary and timeline as JSON")
+    parser.add_argument("--verbose", action="store_true", help="print session errors")
+    args = parser.parse_args()
+
+    if args.pid is None:
+        port = int(args.url.rsplit(":", 1)[-1].split("/")[0])
+        args.pid = find_server_pid(port)
+        if args.pid is None:
+            print(
+                "⚠️ Proceso del servidor no encontrado; sin CPU/memoria", file=sys.stderr
+            )
+
+    summary, timeline = asyncio.run(run(args))
+
+    print(
+        f"\n{'acción':<16}{'n':>7}{'errores':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for action, stats in summary.items():
+        if action == "total":
+            continue
+        print(
+            f"{action:<16}{stats['count']:>7}{stats['errors']:>9}"
+            f"{stats['p50_ms'] or 0:>9.0f}{stats['p95_ms'] or 0:>9.0f}"
+            f"{stats['p99_ms'] or 0:>9.0f}"
+        )
+    print(f"Rendimiento: {summary['total']['throughput_per_s']} acciones/s")
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps({"summary": summary, "timeline": timeline}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
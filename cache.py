@@ -0,0 +1,173 @@
+# Process-wide memo for derived data and encoded charts
+#
+# Keys are tuples such as ("faculty_rating", <data version>, "MATCOM") or
+# ("chart", <data version>, "MATCOM", "trend"), so entries for a replaced
+# dataset are never served again and simply age out. Values are shared by
+# every session, so they must be treated as read-only. The least recently
+# used entry is dropped once MAX_ENTRIES is reached.
+#
+# Misses are single-flight: while one thread computes a key, other threads
+# asking for it wait for that result instead of computing it again, so a
+# cold cache hit by many sessions at once costs one computation per key.
+#
+# Keys can belong to a family, the same value for any data version (e.g.
+# ("chart", "MATCOM", "trend")). get_or_stale() answers a miss with the
+# family's newest cached value while a background job computes the new
+# one, for at most MAX_STALE_SECONDS after the first such miss; past that,
+# callers wait for the fresh value.
+#
+# Behind this memory tier sits cachedb, a SQLite file shared by every
+# process on the host: a miss here is looked up there before computing,
+# and every computed value is written there too. Data versions are content
+# hashes, so the same key means the same value in every process.
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import cachedb
+
+MAX_ENTRIES = 512
+MAX_STALE_SECONDS = float(os.environ.get("DASHBOARD_MAX_STALE", "300"))
+
+_entries = OrderedDict()
+_inflight = {}
+# family -> key of its newest stored value
+_newest = {}
+# family -> when a newer key than the stored one was first asked for
+_stale_since = {}
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "computed": 0,
+    "coalesced": 0,
+    "stale": 0,
+    "evictions": 0,
+}
+
+# Outcome of a flight whose leader was interrupted (e.g. by a Streamlit
+# rerun) rather than failing: waiters compute it themselves
+_RETRY = object()
+
+
+def lookup(key):
+    """(True, value) if key is cached, else (False, None)"""
+    with _lock:
+        if key not in _entries:
+            return False, None
+        _entries.move_to_end(key)
+        return True, _entries[key]
+
+
+def store(key, value):
+    """Cache a value, evicting the least recently used entries if full"""
+    with _lock:
+        _store(key, value)
+
+
+def _store(key, value):
+    _entries[key] = value
+    _entries.move_to_end(key)
+    while len(_entries) > MAX_ENTRIES:
+        _entries.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def get_or_compute(key, compute, family=None):
+    """Cached value for key, computing it once on a miss"""
+    with _lock:
+        if key in _entries:
+            _stats["hits"] += 1
+            _entries.move_to_end(key)
+            return _entries[key]
+
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = Future()
+            _stats["misses"] += 1
+        else:
+            _stats["coalesced"] += 1
+
+    if not leader:
+        # Another thread is computing this key: share its outcome
+        value = flight.result()
+        return get_or_compute(key, compute, family) if value is _RETRY else value
+
+    try:
+        found, value = cachedb.lookup(key)
+        if not found:
+            with _lock:
+                _stats["computed"] += 1
+            value = compute()
+            cachedb.store(key, value)
+    except BaseException as error:
+        with _lock:
+            del _inflight[key]
+        if isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            flight.set_result(_RETRY)
+        raise
+    with _lock:
+        _store(key, value)
+        del _inflight[key]
+        if family is not None:
+            _newest[family] = key
+            _stale_since.pop(family, None)
+    flight.set_result(value)
+    return value
+
+
+def get_or_stale(key, family, compute, refresh, max_stale=None):
+    """Value for key, or the family's previous one while refresh runs
+
+    refresh(key, compute, family) must compute the key in the background,
+    e.g. prefetch.schedule.
+    """
+    max_stale = MAX_STALE_SECONDS if max_stale is None else max_stale
+    with _lock:
+        if key in _entries:
+            _stats["hits"] += 1
+            _entries.move_to_end(key)
+            return _entries[key]
+
+        stale_key = _newest.get(family)
+        if stale_key is not None and stale_key in _entries:
+            since = _stale_since.setdefault(family, time.monotonic())
+            if time.monotonic() - since <= max_stale:
+                _stats["stale"] += 1
+                _entries.move_to_end(stale_key)
+                stale = _entries[stale_key]
+            else:
+                stale_key = None
+        else:
+            stale_key = None
+
+    if stale_key is None:
+        return get_or_compute(key, compute, family)
+    refresh(key, compute, family)
+    return stale
+
+
+def contains(key):
+    with _lock:
+        return key in _entries
+
+
+def stats():
+    """Memory hits, misses, computations, coalesced misses, stale answers
+    and evictions"""
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _newest.clear()
+        _stale_since.clear()
+        for name in _stats:
+            _stats[name] = 0
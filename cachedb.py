@@ -0,0 +1,176 @@
+# On-disk tier of the derived-data cache, shared by every process on the host
+#
+# cache.py keeps hot entries in memory per process; this keeps every entry
+# it computes in a SQLite file, so a restarted or second Streamlit worker
+# reads aggregates and encoded charts instead of computing them again.
+# Keys are the cache's tuples (their repr), values are pickled. Entries
+# expire after TTL_SECONDS, and once the file holds more than MAX_BYTES of
+# values the least recently used ones are deleted.
+#
+# Set DASHBOARD_CACHE_DB="" to disable the disk tier. Any SQLite or pickle
+# error is counted and treated as a miss: the disk tier can make a page
+# faster, never break it.
+#
+# Loading an entry unpickles it, which can run arbitrary code: the file
+# must only be writable by the dashboard's own user, like its data files.
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DB_FILE = os.environ.get("DASHBOARD_CACHE_DB", ".dashboard_cache/derived.sqlite3")
+MAX_BYTES = 64 * 1024 * 1024
+TTL_SECONDS = 24 * 60 * 60
+# Checking the total size scans the table; do it every few writes
+TRIM_EVERY = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+    "expired": 0,
+    "errors": 0,
+}
+_writes = 0
+
+
+def enabled():
+    return bool(DB_FILE)
+
+
+def _connection():
+    """This thread's connection (sqlite3 connections are per thread)"""
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        Path(DB_FILE).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(DB_FILE, timeout=5, isolation_level=None)
+        # WAL lets readers in other processes run while one writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(SCHEMA)
+        _local.connection = connection
+    return connection
+
+
+def _count(name, amount=1):
+    with _lock:
+        _stats[name] += amount
+
+
+def lookup(key):
+    """(True, value) if key is on disk and not expired, else (False, None)"""
+    if not enabled():
+        return False, None
+    try:
+        connection = _connection()
+        row = connection.execute(
+            "SELECT value, expires FROM entries WHERE key = ?", (repr(key),)
+        ).fetchone()
+        now = time.time()
+        if row is None or row[1] < now:
+            if row is not None:
+                connection.execute("DELETE FROM entries WHERE key = ?", (repr(key),))
+                _count("expired")
+            _count("misses")
+            return False, None
+        connection.execute(
+            "UPDATE entries SET accessed = ? WHERE key = ?", (now, repr(key))
+        )
+    except sqlite3.Error:
+        _count("errors")
+        return False, None
+    try:
+        value = pickle.loads(row[0])
+    except Exception:
+        # Truncated data, or a class renamed since the entry was written
+        _count("errors")
+        _count("misses")
+        return False, None
+    _count("hits")
+    return True, value
+
+
+def store(key, value, ttl=TTL_SECONDS):
+    """Write a value to disk, trimming the file now and then"""
+    global _writes
+
+    if not enabled():
+        return
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        _connection().execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (repr(key), payload, len(payload), now + ttl, now),
+        )
+    except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+        _count("errors")
+        return
+    _count("stores")
+
+    with _lock:
+        _writes += 1
+        due = _writes % TRIM_EVERY == 0
+    if due:
+        trim()
+
+
+def trim(max_bytes=MAX_BYTES):
+    """Delete expired entries, then least recently used ones past max_bytes"""
+    try:
+        connection = _connection()
+        expired = connection.execute(
+            "DELETE FROM entries WHERE expires < ?", (time.time(),)
+        ).rowcount
+        _count("expired", expired)
+
+        total = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= max_bytes:
+            return
+        evicted = 0
+        rows = connection.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ).fetchall()
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        _count("evictions", evicted)
+    except sqlite3.Error:
+        _count("errors")
+
+
+def clear():
+    """Delete every entry on disk"""
+    if not enabled():
+        return
+    try:
+        _connection().execute("DELETE FROM entries")
+    except sqlite3.Error:
+        _count("errors")
+
+
+def stats():
+    """Disk hits, misses, stores, evictions, expirations and errors"""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,93 @@
+# Faculty and career metadata from faculties.json
+#
+# One file holds what used to be spread over literal dicts in main.py and
+# data.py: names, founding years, deans, descriptions, careers and, per
+# career, duration, subjects and graduate profile. Entries may omit fields;
+# the "defaults" section fills them in. Some datasets use other acronyms
+# for a faculty (Student_Ratings.csv says FBIOM for FBIO), listed as
+# "aliases".
+#
+# The file is read once per process through the registry, frozen, and
+# indexed by acronym, alias and career so that every lookup is a dict get.
+import json
+
+import registry
+
+CATALOG_FILE = "faculties.json"
+
+
+def load():
+    """Catalog with its lookup tables, built from CATALOG_FILE"""
+    with open(CATALOG_FILE, encoding="utf-8") as source:
+        raw = json.load(source)
+
+    faculty_defaults = raw["defaults"]["faculty"]
+    career_defaults = raw["defaults"]["career"]
+
+    faculties, acronyms, careers_by_faculty = {}, {}, {}
+    for acronym, entry in raw["faculties"].items():
+        faculties[acronym] = {"acronym": acronym, **faculty_defaults, **entry}
+        careers_by_faculty[acronym] = faculties[acronym]["careers"]
+        for alias in (acronym, *entry.get("aliases", ())):
+            acronyms[alias.upper()] = acronym
+
+    careers = {
+        name: {"name": name, **career_defaults, **entry}
+        for name, entry in raw["careers"].items()
+    }
+
+    return {
+        "faculties": faculties,
+        "acronyms": acronyms,
+        "careers_by_faculty": careers_by_faculty,
+        "careers": careers,
+        "faculty_defaults": faculty_defaults,
+        "career_defaults": career_defaults,
+    }
+
+
+def get():
+    """The shared, read-only catalog"""
+    return registry.get(registry.CATALOG, load)
+
+
+def acronym(name):
+    """Canonical acronym for an acronym or alias (unknown ones unchanged)"""
+    return get()["acronyms"].get(name.upper(), name)
+
+
+def faculty_acronyms():
+    """Acronyms of every faculty, in catalog order"""
+    return list(get()["faculties"])
+
+
+def faculty(name):
+    """Metadata of a faculty, with defaults for anything not listed"""
+    catalog = get()
+    return catalog["faculties"].get(
+        acronym(name), {"acronym": name, "name": name, **catalog["faculty_defaults"]}
+    )
+
+
+def full_name(name):
+    """Full name of a faculty"""
+    return faculty(name)["name"]
+
+
+def careers(name):
+    """Careers offered by a faculty"""
+    return faculty(name)["careers"]
+
+
+def career(faculty_name, name):
+    """Metadata of a career, with defaults for anything not listed"""
+    catalog = get()
+    entry = catalog["careers"].get(name, {"name": name, **catalog["career_defaults"]})
+    if "{" not in entry["description"]:
+        return entry
+    return {
+        **entry,
+        "description": entry["description"].format(
+            career=name, faculty=acronym(faculty_name)
+        ),
+    }
@@ -4,6 +4,8 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 
+import catalog
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -29,62 +31,19 @@ SUBJECT_CATEGORIES = [
     "Utilidad de los contenidos impartidos",
 ]
 
-# Lista de todas las facultades con número de carreras estimadas
+# Facultades y carreras, del catálogo compartido con el dashboard
 FACULTIES_INFO = {
-    "MATCOM": {"name": "Matemática y Computación", "careers": 3, "students": 320},
-    "FF": {"name": "Física", "careers": 2, "students": 280},
-    "FQ": {"name": "Química", "careers": 1, "students": 310},
-    "FBIOM": {"name": "Biología", "careers": 3, "students": 295},
-    "FHS": {"name": "Historia y Sociología", "careers": 3, "students": 270},
-    "INSTEC": {"name": "Tecnologías Aplicadas", "careers": 3, "students": 260},
-    "FTUR": {"name": "Turismo", "careers": 1, "students": 240},
-    "FCOM": {"name": "Comunicación", "careers": 2, "students": 230},
-    "LEX": {"name": "Derecho", "careers": 1, "students": 350},
-    "PSICO": {"name": "Psicología", "careers": 1, "students": 320},
-    "FAYL": {"name": "Artes y Letras", "careers": 2, "students": 250},
-    "IFAL": {"name": "Farmacia y Alimentos", "careers": 2, "students": 265},
-    "ISDI": {"name": "Diseño Industrial", "careers": 2, "students": 220},
-    "CSGH": {"name": "Gestión Habana", "careers": 1, "students": 210},
-    "FENHI": {"name": "Economía", "careers": 2, "students": 290},
-    "CONFIN": {"name": "Contabilidad y Finanzas", "careers": 1, "students": 275},
-    "EKO": {"name": "Economía", "careers": 1, "students": 240},
-    "GEO": {"name": "Geografía", "careers": 1, "students": 190},
-    "FLEX": {"name": "Lenguas Extranjeras", "careers": 1, "students": 235},
+    acronym: {
+        "name": catalog.full_name(acronym),
+        "careers": len(catalog.careers(acronym)),
+        "students": catalog.faculty(acronym)["students"],
+    }
+    for acronym in catalog.faculty_acronyms()
 }
 
 # Carreras por facultad
 CAREERS_BY_FACULTY = {
-    "MATCOM": ["Matemática", "Ciencias de la Computación", "Ciencia de Datos"],
-    "FF": ["Licenciatura en Física", "Ingeniería Física"],
-    "FQ": ["Licenciatura en Química"],
-    "FBIOM": [
-        "Licenciatura en Biología",
-        "Licenciatura en Microbiología",
-        "Bioquímica",
-    ],
-    "FHS": [
-        "Licenciatura en Historia",
-        "Licenciatura en Sociología",
-        "Licenciatura en Filosofía",
-    ],
-    "INSTEC": [
-        "Ingeniería en Telecomunicaciones",
-        "Ingeniería Eléctrica",
-        "Ingeniería en Ciencias Aplicadas",
-    ],
-    "FTUR": ["Licenciatura en Turismo"],
-    "FCOM": ["Comunicación Social", "Periodismo"],
-    "LEX": ["Derecho"],
-    "PSICO": ["Licenciatura en Psicología"],
-    "FAYL": ["Licenciatura en Letras", "Licenciatura en Historia del Arte"],
-    "IFAL": ["Licenciatura en Farmacia", "Licenciatura en Ciencia de los Alimentos"],
-    "ISDI": ["Diseño Industrial", "Diseño de Comunicación Visual"],
-    "CSGH": ["Preservación y Gestión del Patrimonio Cultural"],
-    "FENHI": ["Licenciatura en Economía", "Licenciatura en Administración de Empresas"],
-    "CONFIN": ["Licenciatura en Contabilidad y Finanzas"],
-    "EKO": ["Licenciatura en Economía"],
-    "GEO": ["Licenciatura en Geografía"],
-    "FLEX": ["Licenciatura en Lenguas Extranjeras"],
+    acronym: list(catalog.careers(acronym)) for acronym in catalog.faculty_acronyms()
 }
 
 
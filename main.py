@@ -1,14 +1,23 @@
-import os
+import sys
+import tracemalloc
+import uuid
 from datetime import datetime
-from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from PIL import Image
 
 # Import plot utilities
-import plots
+import assets
+import cache
+import cachedb
+import catalog
+import metrics
+import prefetch
+import prerender
+import profiling
+import registry
+import reloader
+import sessions
+import users
 import streamlit as st
 
 # Set page configuration
@@ -19,136 +28,12 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-try:
-    with open("style.css", "r") as style:
-        st.markdown(
-            f"""
-            <style>
-            {style.read()}
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
-except:
-    pass
-
-# Minimal CSS for pointer cursor only
-st.markdown(
-    """
-<style>
-/* style.css - Enhanced version */
-/* Custom styles for the University Dashboard */
-
-/* Cursor pointers for interactive elements */
-button, .stButton > button, .stSelectbox, .stSlider,
-.stCheckbox, .stRadio, .stFormSubmitButton {
-    cursor: pointer !important;
-}
-
-/* Consistent column heights */
-[data-testid="column"] {
-    min-height: 100px;
-}
-
-/* Faculty card styling */
-.faculty-card {
-    background: white;
-    border-radius: 10px;
-    padding: 1rem;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    height: 280px !important;
-    display: flex;
-    flex-direction: column;
-    justify-content: space-between;
-    transition: transform 0.3s ease, box-shadow 0.3s ease;
-}
-
-.faculty-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-}
-
-/* Consistent button heights */
-.stButton > button {
-    min-height: 40px !important;
-    height: 40px !important;
-    white-space: normal !important;
-    word-wrap: break-word !important;
-    line-height: 1.2 !important;
-    padding: 8px 16px !important;
-    margin: 0 !important;
-}
-
-/* Form element styling */
-.stSelectbox > div > div {
-    cursor: pointer !important;
-}
-
-.stSlider > div > div {
-    cursor: pointer !important;
-}
-
-/* Dataframe hiding */
-[data-testid="stDataFrame"] {
-    display: none;
-}
-
-/* Consistent metric cards */
-.metric-card {
-    background: white;
-    border-radius: 10px;
-    padding: 1.5rem;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    height: 150px;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-}
-
-/* Chart container styling */
-.chart-container {
-    background: white;
-    border-radius: 10px;
-    padding: 1rem;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-}
-
-/* Consistent spacing */
-.stTabs [data-baseweb="tab-list"] {
-    gap: 2px;
-}
-
-.stTabs [data-baseweb="tab"] {
-    height: 50px;
-    padding: 10px 16px;
-}
-    /* Pointer cursors for interactive elements */
-    button,
-    .stButton > button,
-    .stSelectbox > div,
-    .stSlider > div,
-    .stCheckbox > div,
-    .stRadio > div,
-    .stFormSubmitButton,
-    .stTextInput > div,
-    .stTextArea > div,
-    .stNumberInput > div,
-    .stDateInput > div,
-    .stTimeInput > div,
-    .stFileUploader > div,
-    .stMultiSelect > div,
-    .stColorPicker > div {
-        cursor: pointer !important;
-    }
-
-    /* Slider handles */
-    .stSlider > div > div > div > div {
-        cursor: pointer !important;
-    }
-</style>
-""",
-    unsafe_allow_html=True,
-)
+# Stylesheet served as a static file; each rerun only sends this link
+_stylesheet = assets.stylesheet_url()
+_base_path = st.get_option("server.baseUrlPath").strip("/")
+if _base_path:
+    _stylesheet = f"/{_base_path}{_stylesheet}"
+st.markdown(f"<link rel='stylesheet' href='{_stylesheet}'>", unsafe_allow_html=True)
 
 # ============================================================================
 # DATA MANAGEMENT
@@ -158,91 +43,133 @@ button, .stButton > button, .stSelectbox, .stSlider,
 class DataManager:
     """Manages loading and accessing data for the dashboard"""
 
-    # Faculty full names mapping
-    FACULTY_FULL_NAMES = {
-        "MATCOM": "Matemática y Computación",
-        "FF": "Física",
-        "FQ": "Química",
-        "FBIO": "Biología",
-        "FHS": "Historia y Sociología",
-        "INSTEC": "Tecnologías y Ciencias Aplicadas",
-        "FTUR": "Turismo",
-        "FCOM": "Comunicación",
-        "LEX": "Derecho",
-        "PSICO": "Psicología",
-        "FAYL": "Artes y Letras",
-        "IFAL": "Farmacia y Alimentos",
-        "ISDI": "Diseño Industrial",
-        "CSGH": "Gestión Habana",
-        "CONFIN": "Contabilidad y Finanzas",
-        "EKO": "Economía",
-        "GEO": "Geografía",
+    DATA_FILES = {
+        "semester_ratings": "Semester_Rating.csv",
+        "matcom_ratings": "MATCOM_Rating.csv",
+        "matcom_classes": "MATCOM_Classes.csv",
+        "subject_ratings": "VD_Rating.csv",
+        "student_ratings": "Student_Ratings.csv",
+    }
+
+    # Columns the views rely on; a new file without them is not swapped in
+    REQUIRED_COLUMNS = {
+        "semester_ratings": ["Facultad"],
+        "student_ratings": ["ID_Estudiante"],
     }
 
     @staticmethod
-    def load_data():
-        """Load all data files"""
-        data_files = {
-            "semester_ratings": "Semester_Rating.csv",
-            "matcom_ratings": "MATCOM_Rating.csv",
-            "matcom_classes": "MATCOM_Classes.csv",
-            "subject_ratings": "VD_Rating.csv",
-        }
+    def load_data(strict=False):
+        """Load all data files, with a content hash of them as "version"
+
+        Missing files become empty frames, or raise if strict.
+        """
+        import hashlib
+        import io
+
+        import pandas as pd
 
         data = {}
-        for key, filename in data_files.items():
+        digest = hashlib.sha256()
+        for key, filename in DataManager.DATA_FILES.items():
+            digest.update(filename.encode("utf-8"))
             try:
-                data[key] = pd.read_csv(filename)
+                with open(filename, "rb") as source:
+                    content = source.read()
             except FileNotFoundError:
+                if strict:
+                    raise
                 st.error(f"⚠️ Archivo no encontrado: {filename}")
                 data[key] = pd.DataFrame()
+                continue
+            digest.update(content)
+            data[key] = pd.read_csv(io.BytesIO(content))
 
+        data["version"] = digest.hexdigest()[:12]
         return data
 
+    @staticmethod
+    def validate_data(data):
+        """Raise ValueError if a reloaded dataset is unusable"""
+        for key, filename in DataManager.DATA_FILES.items():
+            frame = data[key]
+            if frame.empty:
+                raise ValueError(f"{filename} está vacío")
+            missing = set(DataManager.REQUIRED_COLUMNS.get(key, ())) - set(
+                frame.columns
+            )
+            if missing:
+                raise ValueError(f"{filename}: faltan columnas {sorted(missing)}")
+
+    @staticmethod
+    def get_data():
+        """Get the datasets shared by all sessions"""
+        # Swap in new versions of the files while the app runs
+        reloader.watch(
+            registry.DATASETS,
+            DataManager.DATA_FILES.values(),
+            lambda: DataManager.load_data(strict=True),
+            validate=DataManager.validate_data,
+        )
+        return registry.get(registry.DATASETS, DataManager.load_data)
+
+    @staticmethod
+    def data_version():
+        """Content version of the datasets this run uses"""
+        return DataManager.get_data()["version"]
+
+    @staticmethod
+    def versioned(kind, *parts):
+        """Cache key for data derived from the current datasets"""
+        return (kind, DataManager.data_version(), *parts)
+
+    @staticmethod
+    def cached(kind, parts, compute):
+        """Derived value for the current datasets (cached)
+
+        Right after a data change, the previous version's value is served
+        while the worker recomputes it, so no rerun waits for the refresh.
+        """
+        return cache.get_or_stale(
+            DataManager.versioned(kind, *parts),
+            (kind, *parts),
+            compute,
+            refresh=prefetch.schedule,
+        )
+
     @staticmethod
     def get_faculties():
         """Get list of all faculties"""
         try:
-            df = pd.read_csv("Semester_Rating.csv")
+            df = DataManager.get_data()["semester_ratings"]
             faculties = df["Facultad"].tolist()
             return [f for f in faculties if f != "GENERAL"]
         except:
-            return list(DataManager.FACULTY_FULL_NAMES.keys())
+            return catalog.faculty_acronyms()
 
     @staticmethod
     def get_faculty_full_name(acronym):
         """Get full name of a faculty from its acronym"""
-        return DataManager.FACULTY_FULL_NAMES.get(acronym, acronym)
+        return catalog.full_name(acronym)
 
     @staticmethod
     def get_careers(faculty="MATCOM"):
         """Get careers for a specific faculty"""
-        careers_by_faculty = {
-            "MATCOM": ["Matemática", "Ciencias de la Computación", "Ciencia de Datos"],
-            "FF": ["Licenciatura en Física", "Ingeniería Física"],
-            "FQ": ["Licenciatura en Química", "Ingeniería Química"],
-            "FBIO": ["Licenciatura en Biología", "Microbiología", "Bioquímica"],
-            "FHS": ["Licenciatura en Historia", "Sociología", "Filosofía"],
-            "INSTEC": ["Fisica Nuclear", "Radioquimica", "Meteorologia"],
-            "FTUR": ["Licenciatura en Turismo"],
-            "FCOM": ["Comunicación Social", "Periodismo"],
-            "LEX": ["Derecho"],
-            "PSICO": ["Licenciatura en Psicología"],
-            "FAYL": ["Licenciatura en Letras", "Historia del Arte"],
-            "IFAL": ["Licenciatura en Farmacia", "Ciencia de los Alimentos"],
-            "ISDI": ["Diseño Industrial", "Diseño de Comunicación Visual"],
-            "CSGH": ["Gestión del Patrimonio Cultural"],
-            "CONFIN": ["Licenciatura en Contabilidad y Finanzas"],
-            "EKO": ["Licenciatura en Economía"],
-            "GEO": ["Licenciatura en Geografía"],
-        }
-        return careers_by_faculty.get(faculty, ["Carrera Principal"])
+        return catalog.careers(faculty)
 
     @staticmethod
     def get_faculty_rating(faculty):
-        """Get rating data for a specific faculty"""
+        """Get rating data for a specific faculty (cached)"""
+        return DataManager.cached(
+            "faculty_rating",
+            (faculty,),
+            lambda: DataManager.compute_faculty_rating(faculty),
+        )
+
+    @staticmethod
+    def compute_faculty_rating(faculty):
+        """Average and per-category ratings of a faculty"""
         try:
-            df = pd.read_csv("Semester_Rating.csv")
+            df = DataManager.get_data()["semester_ratings"]
             faculty_data = df[df["Facultad"] == faculty]
             if not faculty_data.empty:
                 rating_columns = [
@@ -257,6 +184,8 @@ class DataManager:
     @staticmethod
     def get_career_rating(faculty):
         """Get rating data for a specific faculty"""
+        import pandas as pd
+
         try:
             df = pd.read_csv("")
             faculty_data = df[df["Facultad"] == faculty]
@@ -279,43 +208,16 @@ class DataManager:
 class AuthenticationManager:
     """Handles user authentication"""
 
-    USER_DATABASE = {
-        "estudiante1": {
-            "password": "1234",
-            "nombre": "Juan Pérez",
-            "facultad": "MATCOM",
-            "carrera": "Ciencia de Datos",
-            "role": "estudiante",
-        },
-        "estudiante2": {
-            "password": "1234",
-            "nombre": "Ana Gómez",
-            "facultad": "FF",
-            "carrera": "Física",
-            "role": "estudiante",
-        },
-        "admin": {
-            "password": "admin123",
-            "nombre": "Administrador",
-            "facultad": "Todas",
-            "carrera": "Todas",
-            "role": "administrador",
-        },
-    }
-
     @staticmethod
     def authenticate(username, password):
-        """Authenticate a user"""
-        if username in AuthenticationManager.USER_DATABASE:
-            user_data = AuthenticationManager.USER_DATABASE[username]
-            if password == user_data["password"]:
-                return True, user_data
-        return False, None
+        """Authenticate a user against the user directory"""
+        return users.authenticate(username, password)
 
     @staticmethod
     def init_session_state():
         """Initialize session state variables"""
         default_state = {
+            "session_id": uuid.uuid4().hex[:8],
             "logged_in": False,
             "current_user": None,
             "user_role": None,
@@ -323,8 +225,7 @@ class AuthenticationManager:
             "user_career": None,
             "current_page": "📊 Dashboard Principal",
             "selected_faculty": "MATCOM",
-            "data": {},
-            "comments": AuthenticationManager.load_sample_comments(),
+            "my_comments": [],
             "semester_form_data": {"ratings": {}, "comment": ""},
             "class_form_data": {
                 "class": "Visualización de Datos",
@@ -338,6 +239,56 @@ class AuthenticationManager:
             if key not in st.session_state:
                 st.session_state[key] = value
 
+    @staticmethod
+    def sign_in(profile):
+        """Mark the session as logged in with the given profile"""
+        st.session_state.logged_in = True
+        st.session_state.current_user = profile["nombre"]
+        st.session_state.user_role = profile["role"]
+        st.session_state.user_faculty = profile["facultad"]
+        st.session_state.user_career = profile["carrera"]
+
+    @staticmethod
+    def start_session(profile):
+        """Log the profile in and remember it in the URL for reloads"""
+        AuthenticationManager.sign_in(profile)
+        st.query_params[sessions.QUERY_PARAM] = sessions.issue(profile)
+
+    @staticmethod
+    def restore_session():
+        """Log in from a valid session token in the URL, if there is one"""
+        token = st.query_params.get(sessions.QUERY_PARAM)
+        if not token:
+            return
+        profile = sessions.verify(token)
+        if profile is None:
+            del st.query_params[sessions.QUERY_PARAM]
+            return
+        AuthenticationManager.sign_in(profile)
+
+    @staticmethod
+    def refresh_session():
+        """Swap the URL's session token for a new one once it gets old
+
+        A token that is no longer valid (revoked by a logout in another tab,
+        or expired) ends the session.
+        """
+        token = st.query_params.get(sessions.QUERY_PARAM)
+        fresh = sessions.rotate(token)
+        if fresh is None:
+            AuthenticationManager.end_session()
+            AuthenticationManager.init_session_state()
+        elif fresh != token:
+            st.query_params[sessions.QUERY_PARAM] = fresh
+
+    @staticmethod
+    def end_session():
+        """Revoke the session token and clear the session"""
+        sessions.revoke(st.query_params.get(sessions.QUERY_PARAM))
+        st.query_params.pop(sessions.QUERY_PARAM, None)
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+
     @staticmethod
     def load_sample_comments():
         """Load sample comments"""
@@ -372,6 +323,89 @@ class AuthenticationManager:
         ]
 
 
+# ============================================================================
+# NAVIGATION
+# ============================================================================
+
+
+class Router:
+    """Keeps the current page in the URL and switches pages from callbacks
+
+    Widgets change the page in their on_change/on_click callbacks, which run
+    before the script, so a click costs one run that already renders the new
+    page. The URL (?page=facultad&f=MATCOM) is read when a session starts,
+    which makes deep links and reloads land on the right page.
+    """
+
+    PAGE_PARAM = "page"
+    FACULTY_PARAM = "f"
+
+    MAIN_PAGE = "📊 Dashboard Principal"
+    FACULTY_PAGE = "🏛️ Dashboard Facultad"
+
+    SLUGS = {
+        "📊 Dashboard Principal": "principal",
+        "🏛️ Dashboard Facultad": "facultad",
+        "⭐ Evaluar Semestre": "semestre",
+        "📚 Evaluar Clase": "clase",
+        "💬 Comentarios": "comentarios",
+    }
+    PAGES = {slug: page for page, slug in SLUGS.items()}
+
+    @staticmethod
+    def open_from_url():
+        """Start a new session on the page named in the URL"""
+        page = Router.PAGES.get(st.query_params.get(Router.PAGE_PARAM))
+        if page:
+            st.session_state.current_page = page
+        faculty = st.query_params.get(Router.FACULTY_PARAM)
+        if faculty:
+            st.session_state.selected_faculty = faculty.upper()
+
+    @staticmethod
+    def publish():
+        """Write the current page into the URL if it changed
+
+        The URL also carries the session token (sessions.QUERY_PARAM), which
+        logs in whoever opens it until it is rotated or revoked: a link to
+        share must be built from PAGE_PARAM and FACULTY_PARAM only, not
+        copied from the address bar.
+        """
+        route = {Router.PAGE_PARAM: Router.SLUGS[st.session_state.current_page]}
+        if st.session_state.current_page == Router.FACULTY_PAGE:
+            route[Router.FACULTY_PARAM] = st.session_state.selected_faculty
+
+        for param in (Router.PAGE_PARAM, Router.FACULTY_PARAM):
+            if param not in route:
+                st.query_params.pop(param, None)
+            elif st.query_params.get(param) != route[param]:
+                st.query_params[param] = route[param]
+
+    @staticmethod
+    def go(page, faculty=None):
+        """Callback: switch to page (and faculty)"""
+        st.session_state.current_page = page
+        if faculty:
+            st.session_state.selected_faculty = faculty
+
+    @staticmethod
+    def on_page_selected():
+        """Callback of the sidebar radio"""
+        Router.go(st.session_state.nav_page)
+
+    @staticmethod
+    def on_faculty_selected():
+        """Callback of the faculty selector"""
+        st.session_state.selected_faculty = st.session_state.faculty_selector
+
+    @staticmethod
+    def on_gallery_click(faculties):
+        """Callback of the faculty gallery"""
+        clicked = st.session_state.faculty_gallery
+        if clicked is not None and clicked > -1:
+            Router.go(Router.FACULTY_PAGE, faculties[clicked])
+
+
 # ============================================================================
 # PAGE COMPONENTS
 # ============================================================================
@@ -384,168 +418,117 @@ class DashboardComponents:
     def create_header(title, icon="🎓"):
         """Create a styled header"""
         st.markdown(
-            f"""
-            <div style='text-align: center; padding: 1rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                     border-radius: 10px; margin-bottom: 2rem;'>
-                <h1 style='color: white; margin: 0;'>{icon} {title}</h1>
-                <p style='color: rgba(255,255,255,0.8); margin: 0;'>Universidad de La Habana</p>
-            </div>
-            """,
+            f"<div class='uh-header'><h1>{icon} {title}</h1>"
+            "<p>Universidad de La Habana</p></div>",
             unsafe_allow_html=True,
         )
 
     @staticmethod
     def create_metric_card(title, value, icon="📊", color="#667eea"):
         """Create a metric card"""
-        return f"""
-            <div style='background: white; padding: 1rem; border-radius: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); border-left: 4px solid {color};'>
-                <div style='display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem;'>
-                    <span style='font-size: 1.5rem;'>{icon}</span>
-                    <span style='font-weight: bold; color: #666;'>{title}</span>
-                </div>
-                <div style='font-size: 2rem; font-weight: bold; color: #333;'>{value}</div>
-            </div>
-        """
+        accent = "" if color == "#667eea" else f" style='border-left-color: {color}'"
+        return (
+            f"<div class='uh-metric'{accent}><div class='uh-metric-title'>"
+            f"<span class='uh-metric-icon'>{icon}</span>"
+            f"<span class='uh-metric-label'>{title}</span></div>"
+            f"<div class='uh-metric-value'>{value}</div></div>"
+        )
 
     @staticmethod
-    def create_faculty_card(faculty_acronym, index):
-        """Create a consistent faculty card with full name"""
-        full_name = DataManager.get_faculty_full_name(faculty_acronym)
-
-        # Truncate long names
-        display_name = full_name
-        if len(full_name) > 40:
-            display_name = full_name[:37] + "..."
-
-        # Create card in fixed height container
-        with st.container():
-            # Faculty icon and acronym
-            found = False
-            for element in os.listdir("logos"):
-                if faculty_acronym.lower() in element:
-                    found = True
-                    with st.container():
-                        img = Image.open("logos/" + element)
-                        img = img.resize((300, 300))
-                        st.image(img)
-                        break
-            if not found:
-                with st.container():
-                    col1, col2 = st.columns([1, 3])
-                    with col1:
-                        st.markdown(
-                            f"<div style='text-align: center; font-size: 2rem;'>🏛️</div>",
-                            unsafe_allow_html=True,
-                        )
-                    with col2:
-                        st.markdown(
-                            f"<h3 style='margin: 0;'>{faculty_acronym}</h3>",
-                            unsafe_allow_html=True,
-                        )
-            with st.container(height=100):
-                # Full name
-                st.markdown(
-                    f"<div style='text-align: center; padding: 10px 0; font-size: 0.9rem; color: #666;'>{display_name}</div>",
-                    unsafe_allow_html=True,
-                )
+    def render_chart(build, name=None):
+        """Build and encode a figure (smaller of PNG or minified SVG) for st.image"""
+        import matplotlib.pyplot as plt
 
-            # Spacing
-            # st.write("")
-            # st.write("")
+        import plots
 
-            # Explore button at bottom
-            if st.button(
-                "Explorar",
-                key=f"faculty_btn_{faculty_acronym}_{index}",
-                use_container_width=True,
-            ):
-                st.session_state.current_page = "🏛️ Dashboard Facultad"
-                st.session_state.selected_faculty = faculty_acronym
-                st.rerun()
+        with plots.figure_lock:
+            fig = build()
+            try:
+                return plots.encode(fig, name=name)[1]
+            finally:
+                plt.close(fig)
 
     @staticmethod
-    def create_student_distribution_chart():
-        """Create a student distribution by year chart"""
-        years_data = {
-            "1er Año": np.random.randint(80, 120),
-            "2do Año": np.random.randint(70, 110),
-            "3er Año": np.random.randint(60, 100),
-            "4to Año": np.random.randint(50, 90),
-            "5to Año": np.random.randint(40, 80),
-        }
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        colors = plt.cm.Blues(np.linspace(0.4, 0.8, len(years_data)))
-
-        bars = ax.bar(years_data.keys(), years_data.values(), color=colors)
-        ax.set_xlabel("Año Académico", fontsize=12)
-        ax.set_ylabel("Cantidad de Estudiantes", fontsize=12)
-        ax.set_title(
-            "Distribución de Estudiantes por Año", fontsize=14, fontweight="bold"
+    def show_cached_chart(key, build, name=None):
+        """Show a chart, building it only if it is not cached yet"""
+        payload = DataManager.cached(
+            "chart", key, lambda: DashboardComponents.render_chart(build, name)
         )
+        st.image(payload, use_container_width=True)
 
-        # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height + 0.5,
-                f"{int(height)}",
-                ha="center",
-                va="bottom",
-                fontsize=10,
+    @staticmethod
+    def show_prerendered(chart, build, name=None):
+        """Show a pre-rendered chart by URL, falling back to a live render"""
+        url = prerender.chart_url(chart)
+        if url:
+            # Served from static/: the page only carries the URL
+            if _base_path:
+                url = f"/{_base_path}{url}"
+            st.markdown(
+                f"<img class='uh-chart' src='{url}' alt='{chart}'>",
+                unsafe_allow_html=True,
+            )
+        else:
+            # Drawn under figure_lock like every other chart: pyplot's
+            # global state is shared with the prefetch thread
+            st.image(
+                DashboardComponents.render_chart(build, name),
+                use_container_width=True,
             )
-
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-
-        return fig
 
     @staticmethod
-    def create_career_comparison_chart(faculty):
-        """Create a bar chart comparing careers by average grade"""
-        careers = DataManager.get_careers(faculty)
-        avg_grades = {
-            career: round(np.random.uniform(3.5, 4.5), 2) for career in careers
-        }
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        colors = plt.cm.viridis(np.linspace(0.3, 0.7, len(careers)))
-
-        display_names = [
-            name[:25] + "..." if len(name) > 25 else name for name in careers
-        ]
-
-        bars = ax.bar(display_names, avg_grades.values(), color=colors)
-        ax.set_xlabel("Carrera", fontsize=12)
-        ax.set_ylabel("Calificación Promedio (1-5)", fontsize=12)
-        ax.set_title(
-            f"Calificaciones Promedio por Carrera", fontsize=14, fontweight="bold"
+    def faculty_card_image(faculty_acronym):
+        """URL of the pre-composited gallery card for a faculty"""
+        url = assets.card_url(
+            faculty_acronym, DataManager.get_faculty_full_name(faculty_acronym)
         )
-        ax.set_ylim(3.0, 5.0)
-
-        # Add value labels
-        for bar, grade in zip(bars, avg_grades.values()):
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height + 0.02,
-                f"{grade:.2f}",
-                ha="center",
-                va="bottom",
-                fontsize=10,
-            )
+        # The gallery component lives in an iframe, so prefix the base path
+        base_path = st.get_option("server.baseUrlPath").strip("/")
+        return f"/{base_path}{url}" if base_path else url
 
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
+    @staticmethod
+    def create_faculty_gallery(faculties):
+        """Render all faculty cards as a single clickable image grid"""
+        import importlib.util
+        import os
+
+        import streamlit.components.v1 as components
+
+        # Declared here on st-clickable-images' frontend build (pinned in
+        # requirements.txt), as its clickable_images wrapper does not pass
+        # on_change through
+        package = importlib.util.find_spec("st_clickable_images")
+        clickable_images = components.declare_component(
+            "clickable_images",
+            path=os.path.join(
+                package.submodule_search_locations[0], "frontend", "build"
+            ),
+        )
 
-        return fig
+        clickable_images(
+            paths=[DashboardComponents.faculty_card_image(f) for f in faculties],
+            titles=[DataManager.get_faculty_full_name(f) for f in faculties],
+            div_style={
+                "display": "grid",
+                "grid-template-columns": "repeat(4, 1fr)",
+                "gap": "1rem",
+            },
+            img_style={
+                "width": "100%",
+                "border-radius": "10px",
+                "box-shadow": "0 2px 4px rgba(0,0,0,0.1)",
+                "cursor": "pointer",
+            },
+            key="faculty_gallery",
+            default=-1,
+            on_change=lambda: Router.on_gallery_click(faculties),
+        )
 
     @staticmethod
     def create_grade_distribution_chart():
         """Create a grade distribution chart"""
+        import matplotlib.pyplot as plt
+
         grades_data = {
             "2": np.random.randint(5, 15),
             "3": np.random.randint(20, 40),
@@ -604,35 +587,43 @@ class LoginView:
                 )
 
             if login_btn:
-                authenticated, user_data = AuthenticationManager.authenticate(
-                    username, password
-                )
+                try:
+                    authenticated, user_data = AuthenticationManager.authenticate(
+                        username, password
+                    )
+                except users.Busy:
+                    authenticated, user_data = None, None
+                    st.error(
+                        "Hay muchos inicios de sesión en este momento. "
+                        "Inténtalo de nuevo en unos segundos."
+                    )
                 if authenticated:
-                    st.session_state.logged_in = True
-                    st.session_state.current_user = user_data["nombre"]
-                    st.session_state.user_role = user_data["role"]
-                    st.session_state.user_faculty = user_data["facultad"]
-                    st.session_state.user_career = user_data["carrera"]
+                    AuthenticationManager.start_session(user_data)
                     st.success(f"¡Bienvenido(a), {user_data['nombre']}!")
                     st.rerun()
-                else:
+                elif authenticated is not None:
                     st.error("Usuario o contraseña incorrectos")
 
             if guest_btn:
-                st.session_state.logged_in = True
-                st.session_state.current_user = "Invitado"
-                st.session_state.user_role = "invitado"
-                st.session_state.user_faculty = "General"
-                st.session_state.user_career = "General"
+                AuthenticationManager.start_session(
+                    {
+                        "nombre": "Invitado",
+                        "role": "invitado",
+                        "facultad": "General",
+                        "carrera": "General",
+                    }
+                )
                 st.success("Has ingresado como invitado.")
                 st.rerun()
 
-        st.markdown("---")
-        st.markdown("### Credenciales de Prueba")
-        st.markdown("""
-        - **Estudiante:** `estudiante1` / `1234`
-        - **Administrador:** `admin` / `admin123`
-        """)
+        # Only the demo accounts use these passwords; a built roster does not
+        if users.demo_mode():
+            st.markdown("---")
+            st.markdown("### Credenciales de Prueba")
+            st.markdown("""
+            - **Estudiante:** `estudiante1` / `1234`
+            - **Administrador:** `admin` / `admin123`
+            """)
 
 
 class MainDashboardView:
@@ -640,16 +631,19 @@ class MainDashboardView:
 
     @staticmethod
     def render():
+        import plots
+
         DashboardComponents.create_header("Dashboard Principal")
 
         # Load data
-        data = DataManager.load_data()
+        data = DataManager.get_data()
 
         if not data["semester_ratings"].empty:
             # Overall metrics with equal columns
             col2, col3, col4 = st.columns(3)
 
-            avg_rating = data["semester_ratings"].iloc[:, 1:].mean().mean()
+            kpis = metrics.kpis(DataManager.get_data())
+            avg_rating = kpis["overall_rating"]
             # with col1:
             # avg_rating = data["semester_ratings"].iloc[:, 1:].mean().mean()
             #     st.markdown(
@@ -660,38 +654,31 @@ class MainDashboardView:
             #     )
 
             with col2:
-                total_faculties = len(data["semester_ratings"]) - 1
                 st.markdown(
                     DashboardComponents.create_metric_card(
-                        "Facultades", total_faculties, icon="🏛️"
+                        "Facultades",
+                        metrics.format_kpi(kpis["faculty_count"], "{}"),
+                        icon="🏛️",
                     ),
                     unsafe_allow_html=True,
                 )
 
             with col3:
-                # total_students = (
-                #     data["matcom_ratings"]["ID"].nunique()
-                #     if not data["matcom_ratings"].empty
-                #     else 0
-                # )
-                total_students = 1429
                 st.markdown(
                     DashboardComponents.create_metric_card(
-                        "Estudiantes", f"{total_students:,}", icon="👥"
+                        "Estudiantes",
+                        metrics.format_kpi(kpis["student_count"], "{:,}"),
+                        icon="👥",
                     ),
                     unsafe_allow_html=True,
                 )
 
             with col4:
-                avg_grade = (
-                    data["matcom_classes"]["Nota"].mean()
-                    if not data["matcom_classes"].empty
-                    and "Nota" in data["matcom_classes"].columns
-                    else 0
-                )
                 st.markdown(
                     DashboardComponents.create_metric_card(
-                        "Nota Promedio", f"{avg_grade:.1f}/5", icon="📝"
+                        "Nota Promedio",
+                        metrics.format_kpi(kpis["average_grade"], "{:.1f}/5"),
+                        icon="📝",
                     ),
                     unsafe_allow_html=True,
                 )
@@ -702,35 +689,41 @@ class MainDashboardView:
             st.subheader("📈 Calificación del Semestre")
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
-                st.pyplot(plots.color_legend()[0])
+                DashboardComponents.show_prerendered(
+                    "color_legend", lambda: plots.color_legend()[0], name="color_legend"
+                )
             col1, col2 = st.columns(2)
             with col1:
-                st.pyplot(plots.rating_pie(avg_rating)[0])
+                DashboardComponents.show_prerendered(
+                    "general_pie",
+                    lambda: plots.rating_pie(avg_rating)[0],
+                    name="rating_pie",
+                )
             with col2:
                 avg_by_category = data["semester_ratings"].iloc[:, 1:].mean()
-                st.pyplot(plots.rating_hist(avg_by_category)[0])
+                DashboardComponents.show_prerendered(
+                    "general_hist",
+                    lambda: plots.rating_hist(avg_by_category)[0],
+                    name="rating_hist",
+                )
 
             # Color legend
 
             # Faculty Averages
             with st.expander("📊 Ver Calificaciones por Facultad"):
-                st.pyplot(
-                    plots.fac_avrg(data["semester_ratings"].set_index("Facultad"))[0]
+                DashboardComponents.show_prerendered(
+                    "fac_avrg",
+                    lambda: plots.fac_avrg(
+                        data["semester_ratings"].set_index("Facultad")
+                    )[0],
+                    name="fac_avrg",
                 )
 
             st.divider()
 
             # Faculty Gallery
             st.subheader("🏛️ Facultades de la Universidad")
-            faculties = DataManager.get_faculties()
-
-            # Create 4 equal columns
-            cols = st.columns(4)
-
-            for idx, faculty in enumerate(faculties):
-                col_idx = idx % 4
-                with cols[col_idx]:
-                    DashboardComponents.create_faculty_card(faculty, idx)
+            DashboardComponents.create_faculty_gallery(DataManager.get_faculties())
 
 
 class FacultyDashboardView:
@@ -738,73 +731,128 @@ class FacultyDashboardView:
 
     @staticmethod
     def render():
-        # Get selected faculty from session state
+        # Get selected faculty from session state (a deep link may name an
+        # unknown one)
+        faculties = DataManager.get_faculties()
         selected_faculty = st.session_state.get("selected_faculty", "MATCOM")
+        if selected_faculty not in faculties:
+            selected_faculty = faculties[0]
+        st.session_state.selected_faculty = selected_faculty
 
         # Faculty selector
         col1, col2 = st.columns([4, 1])
         with col1:
-            selected_faculty = st.selectbox(
+            st.session_state.faculty_selector = selected_faculty
+            st.selectbox(
                 "Selecciona una facultad",
-                DataManager.get_faculties(),
-                index=DataManager.get_faculties().index(selected_faculty)
-                if selected_faculty in DataManager.get_faculties()
-                else 0,
+                faculties,
                 key="faculty_selector",
+                on_change=Router.on_faculty_selected,
             )
 
-        # Store current faculty in session state
-        st.session_state.selected_faculty = selected_faculty
-
         with col2:
             st.markdown("")
             st.markdown("")
-            if st.button("⬅️ Volver", use_container_width=True):
-                st.session_state.current_page = "📊 Dashboard Principal"
-                st.rerun()
+            st.button(
+                "⬅️ Volver",
+                use_container_width=True,
+                on_click=Router.go,
+                args=(Router.MAIN_PAGE,),
+            )
 
         DashboardComponents.create_header(f"Dashboard de {selected_faculty}", "🏛️")
 
-        # Create tabs
+        # Tabs track their state, so only the selected one is rendered
         tab1, tab2, tab3 = st.tabs(
-            ["📊 Información General", "🎓 Carreras", "📈 Rendimiento"]
+            ["📊 Información General", "🎓 Carreras", "📈 Rendimiento"],
+            key="faculty_tab",
+            on_change="rerun",
         )
 
-        with tab1:
-            FacultyDashboardView.render_general_info(selected_faculty)
+        if tab1.open:
+            with tab1:
+                FacultyDashboardView.render_general_info(selected_faculty)
+
+        if tab2.open:
+            with tab2:
+                FacultyDashboardView.render_careers_section(selected_faculty)
+
+        if tab3.open:
+            with tab3:
+                FacultyDashboardView.render_performance_section(selected_faculty)
+
+        FacultyDashboardView.prefetch_likely_faculties(selected_faculty)
 
-        with tab2:
-            FacultyDashboardView.render_careers_section(selected_faculty)
+    @staticmethod
+    def prefetch_likely_faculties(faculty):
+        """Warm caches for the faculties the user may switch to next"""
+        recent = st.session_state.get("recent_faculties", [])
+        candidates = prefetch.likely_next(
+            faculty,
+            DataManager.get_faculties(),
+            own=st.session_state.user_faculty,
+            recent=recent,
+        )
+        st.session_state.recent_faculties = prefetch.remember(recent, faculty)
 
-        with tab3:
-            FacultyDashboardView.render_performance_section(selected_faculty)
+        for candidate in candidates:
+            for key, compute, family in FacultyDashboardView.cache_jobs(candidate):
+                prefetch.schedule(key, compute, family)
+
+    @staticmethod
+    def cache_jobs(faculty):
+        """(key, compute, family) for every cached value of a faculty's pages"""
+        jobs = [
+            (
+                DataManager.versioned("faculty_rating", faculty),
+                lambda: DataManager.compute_faculty_rating(faculty),
+                ("faculty_rating", faculty),
+            )
+        ]
+        for chart, (build, name) in FacultyDashboardView.chart_builders(
+            faculty
+        ).items():
+            jobs.append(
+                (
+                    DataManager.versioned("chart", faculty, chart),
+                    lambda b=build, n=name: DashboardComponents.render_chart(b, n),
+                    ("chart", faculty, chart),
+                )
+            )
+        return jobs
+
+    @staticmethod
+    def chart_builders(faculty):
+        """chart -> (build, name) for the charts of the performance tab"""
+        return {
+            "enrollment": (FacultyDashboardView.create_enrollment_chart, "matr_pie"),
+            "grades": (
+                FacultyDashboardView.create_grade_distribution_chart,
+                "grade_distribution",
+            ),
+            "career_average": (
+                lambda: FacultyDashboardView.create_career_average_chart(faculty),
+                "career_average",
+            ),
+            "trend": (
+                lambda: FacultyDashboardView.create_performance_trend_chart(faculty),
+                "performance_trend",
+            ),
+        }
 
     @staticmethod
     def render_general_info(faculty):
         """Render general information about the faculty"""
+        import pandas as pd
+
+        import plots
+
         col1, col2 = st.columns([1, 1])
 
         with col1:
-            descriptions = {
-                "MATCOM": "La Facultad de Matemática y Computación (MATCOM) es el centro rector para la formación de profesionales en Matemática, Ciencias de la Computación y Ciencia de Datos en Cuba. Fundada en 1976, combina tradición matemática con innovación tecnológica.",
-                "FF": "La Facultad de Física forma profesionales con sólida formación científica para la docencia, investigación e innovación tecnológica en diversas áreas de la física pura y aplicada.",
-                "FQ": "Facultad de Química, centro de excelencia en la formación de químicos con capacidad para la investigación, producción y control de calidad en la industria química y farmacéutica.",
-                "FBIO": "Facultad de Biología dedicada al estudio de los seres vivos, formando biólogos, microbiólogos y bioquímicos para la investigación y aplicación en ciencias de la vida.",
-                "FHS": "Facultad de Historia y Sociología que estudia el desarrollo de las sociedades humanas, formando historiadores y sociólogos con visión crítica y analítica.",
-                "INSTEC": "Instituto Superior de Tecnologías y Ciencias Aplicadas, centro de excelencia en ingenierías avanzadas y tecnologías de punta.",
-                "FTUR": "Facultad de Turismo dedicada a la formación de profesionales para la gestión y desarrollo del sector turístico.",
-                "FCOM": "Facultad de Comunicación Social que forma comunicadores y periodistas para los medios de comunicación y relaciones públicas.",
-                "LEX": "Facultad de Derecho, formando juristas con sólidos conocimientos en ciencias jurídicas y sociales.",
-                "PSICO": "Facultad de Psicología dedicada al estudio del comportamiento humano y la formación de psicólogos clínicos, educativos y organizacionales.",
-                "FAYL": "Facultad de Artes y Letras, centro de formación en literatura, arte y cultura con tradición humanística.",
-                "IFAL": "Instituto de Farmacia y Alimentos, especializado en ciencias farmacéuticas y tecnología de alimentos.",
-                "ISDI": "Instituto Superior de Diseño Industrial, formando diseñadores para la industria y la comunicación visual.",
-                "CSGH": "Centro de Estudios de Gestión Habana, especializado en administración, economía y negocios.",
-            }
-
             st.markdown(f"""
                 ### Sobre la Facultad
-                {descriptions.get(faculty, "Facultad de la Universidad de La Habana con larga tradición académica y excelencia en la formación profesional.")}
+                {catalog.faculty(faculty)["description"]}
             """)
         with col1:
             st.markdown("### 📋 Información Clave")
@@ -822,19 +870,13 @@ class FacultyDashboardView:
                 st.markdown(f"**{label}:** {value}")
 
         with col2:
-            logo_path = f"logos/{faculty}.png"
-            if os.path.exists(logo_path):
-                st.image(logo_path, use_container_width=True)
+            logo_url = assets.logo_url(faculty)
+            if logo_url:
+                st.image(logo_url, use_container_width=True)
             else:
                 st.markdown(
-                    f"""
-                    <div style='text-align: center; padding: 1.5rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                             border-radius: 10px; color: white;'>
-                        <div style='font-size: 3rem;'>🏛️</div>
-                        <h3 style='margin: 0.5rem 0;'>{faculty}</h3>
-                        <p style='margin: 0; font-size: 0.9rem;'>{DataManager.get_faculty_full_name(faculty)}</p>
-                    </div>
-                    """,
+                    f"<div class='uh-logo-fallback'><div>🏛️</div><h3>{faculty}</h3>"
+                    f"<p>{DataManager.get_faculty_full_name(faculty)}</p></div>",
                     unsafe_allow_html=True,
                 )
 
@@ -850,15 +892,21 @@ class FacultyDashboardView:
 
         with col1:
             st.markdown("### Calificación del Semestre")
-            fig, ax = plots.rating_pie(avg_rating)
-            st.pyplot(fig, use_container_width=True)
+            DashboardComponents.show_prerendered(
+                f"{faculty}_pie",
+                lambda: plots.rating_pie(avg_rating)[0],
+                name="rating_pie",
+            )
 
         with col2:
             if rating_details:
                 st.markdown("### Calificación por Categoría")
                 ratings_series = pd.Series(rating_details)
-                fig, ax = plots.rating_hist(ratings_series)
-                st.pyplot(fig, use_container_width=True)
+                DashboardComponents.show_prerendered(
+                    f"{faculty}_hist",
+                    lambda: plots.rating_hist(ratings_series)[0],
+                    name="rating_hist",
+                )
             else:
                 st.info("No hay datos de calificación disponibles por categoría")
 
@@ -873,6 +921,12 @@ class FacultyDashboardView:
             st.info("No hay información de carreras disponible para esta facultad.")
             return
 
+        FacultyDashboardView.render_career_details(faculty, careers)
+
+    @staticmethod
+    @st.fragment
+    def render_career_details(faculty, careers):
+        """Career selector and details; reruns on its own"""
         selected_career = st.selectbox(
             "Selecciona una carrera para ver detalles",
             careers,
@@ -965,51 +1019,68 @@ class FacultyDashboardView:
         # Main charts - 2x2 grid
         st.subheader("📊 Visualizaciones")
 
+        charts = FacultyDashboardView.chart_builders(faculty)
+
         # First row
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("##### 👥 Estudiantes por Año")
-            enrollment_data = pd.DataFrame(
-                {
-                    "Brigada": ["1er Año", "2do Año", "3er Año", "4to Año", "5to Año"],
-                    "Count": [
-                        np.random.randint(80, 120),
-                        np.random.randint(70, 110),
-                        np.random.randint(60, 100),
-                        np.random.randint(50, 90),
-                        np.random.randint(40, 80),
-                    ],
-                }
+            DashboardComponents.show_cached_chart(
+                (faculty, "enrollment"), *charts["enrollment"]
             )
 
-            colors = ["#4C72B0", "#55A868", "#C44E52", "#8172B3", "#CCB974"]
-            fig, ax = plots.matr_pie(enrollment_data, colors)
-            fig.set_size_inches(8, 6)
-            plt.rcParams.update({"font.size": 12})
-            st.pyplot(fig, use_container_width=True)
-
         with col2:
             st.markdown("##### 📝 Distribución de Calificaciones")
-            fig = FacultyDashboardView.create_grade_distribution_chart()
-            st.pyplot(fig, use_container_width=True)
+            DashboardComponents.show_cached_chart(
+                (faculty, "grades"), *charts["grades"]
+            )
 
         # Second row
         col3, col4 = st.columns(2)
 
         with col3:
             st.markdown("##### 📊 Promedio por Carrera")
-            fig = FacultyDashboardView.create_career_average_chart(faculty)
-            st.pyplot(fig, use_container_width=True)
+            DashboardComponents.show_cached_chart(
+                (faculty, "career_average"), *charts["career_average"]
+            )
 
         with col4:
             st.markdown("##### 📈 Evolución del Rendimiento")
-            fig = FacultyDashboardView.create_performance_trend_chart(faculty)
-            st.pyplot(fig, use_container_width=True)
+            DashboardComponents.show_cached_chart((faculty, "trend"), *charts["trend"])
+
+    @staticmethod
+    def create_enrollment_chart():
+        """Create the students per year pie chart"""
+        import matplotlib.pyplot as plt
+        import pandas as pd
+
+        import plots
+
+        enrollment_data = pd.DataFrame(
+            {
+                "Brigada": ["1er Año", "2do Año", "3er Año", "4to Año", "5to Año"],
+                "Count": [
+                    np.random.randint(80, 120),
+                    np.random.randint(70, 110),
+                    np.random.randint(60, 100),
+                    np.random.randint(50, 90),
+                    np.random.randint(40, 80),
+                ],
+            }
+        )
+
+        colors = ["#4C72B0", "#55A868", "#C44E52", "#8172B3", "#CCB974"]
+        fig, ax = plots.matr_pie(enrollment_data, colors)
+        fig.set_size_inches(8, 6)
+        plt.rcParams.update({"font.size": 12})
+        return fig
 
     @staticmethod
     def create_grade_distribution_chart():
         """Create a clean grade distribution chart"""
+        import matplotlib.pyplot as plt
+
         grades_data = {
             "2": np.random.randint(5, 15),
             "3": np.random.randint(20, 40),
@@ -1048,6 +1119,8 @@ class FacultyDashboardView:
     @staticmethod
     def create_career_average_chart(faculty):
         """Create career average grades chart"""
+        import matplotlib.pyplot as plt
+
         careers = DataManager.get_careers(faculty)
         avg_grades = {
             career: round(np.random.uniform(3.5, 4.5), 2) for career in careers
@@ -1091,6 +1164,8 @@ class FacultyDashboardView:
     @staticmethod
     def create_performance_trend_chart(faculty):
         """Create performance trend chart"""
+        import matplotlib.pyplot as plt
+
         years = ["2019", "2020", "2021", "2022", "2023"]
         performance = [round(np.random.uniform(3.3, 4.7), 2) for _ in years]
 
@@ -1127,65 +1202,17 @@ class FacultyDashboardView:
     @staticmethod
     def get_founding_year(faculty):
         """Get founding year for a faculty"""
-        founding_years = {
-            "MATCOM": "1976",
-            "FF": "1962",
-            "FQ": "1963",
-            "FBIO": "1964",
-            "FHS": "1962",
-            "INSTEC": "1980",
-            "FTUR": "1995",
-            "FCOM": "1990",
-            "LEX": "1900",
-            "PSICO": "1970",
-            "FAYL": "1962",
-            "IFAL": "1975",
-            "ISDI": "1985",
-            "CSGH": "1998",
-        }
-        return founding_years.get(faculty, "1960")
+        return catalog.faculty(faculty)["founded"]
 
     @staticmethod
     def get_dean(faculty):
         """Get dean/director for a faculty"""
-        deans = {
-            "MATCOM": "Dr. Carlos Martínez",
-            "FF": "Dr. Arbelio Pentón Madrigal",
-            "FQ": "Dra. Marta Álvarez",
-            "FBIO": "Dr. Pedro Pablo García",
-            "FHS": "Dra. Mayra Mena",
-            "INSTEC": "Dr. Roberto González",
-            "FTUR": "MSc. Ana López",
-            "FCOM": "Dr. Julio García",
-            "LEX": "Dr. Fernando Martínez",
-            "PSICO": "Dra. Laura Rodríguez",
-            "FAYL": "Dr. Jorge Pérez",
-            "IFAL": "Dra. Carmen Ruiz",
-            "ISDI": "MSc. Alejandro Díaz",
-            "CSGH": "Dr. Ricardo Fernández",
-        }
-        return deans.get(faculty, "Por definir")
+        return catalog.faculty(faculty)["dean"]
 
     @staticmethod
     def get_student_count(faculty):
         """Get student count for a faculty"""
-        student_counts = {
-            "MATCOM": "550",
-            "FF": "420",
-            "FQ": "380",
-            "FBIO": "450",
-            "FHS": "320",
-            "INSTEC": "280",
-            "FTUR": "200",
-            "FCOM": "250",
-            "LEX": "600",
-            "PSICO": "350",
-            "FAYL": "280",
-            "IFAL": "220",
-            "ISDI": "180",
-            "CSGH": "150",
-        }
-        return student_counts.get(faculty, "300")
+        return catalog.faculty(faculty)["students"]
 
     @staticmethod
     def get_faculty_stats(faculty):
@@ -1204,55 +1231,10 @@ class FacultyDashboardView:
     @staticmethod
     def get_career_info(faculty, career):
         """Get detailed information about a specific career"""
-        durations = {
-            "Matemática": 5,
-            "Ciencias de la Computación": 5,
-            "Ciencia de Datos": 4,
-            "Licenciatura en Física": 5,
-            "Ingeniería Física": 5,
-            "Licenciatura en Química": 5,
-            "Licenciatura en Biología": 5,
-            "Licenciatura en Microbiología": 5,
-            "Licenciatura en Bioquímica y Biología Molecular": 5,
-            "Licenciatura en Historia": 5,
-            "Licenciatura en Sociología": 5,
-            "Licenciatura en Filosofía": 5,
-            "Ingeniería en Telecomunicaciones": 5,
-            "Ingeniería Eléctrica": 5,
-            "Ingeniería en Ciencias Aplicadas": 5,
-            "Licenciatura en Turismo": 5,
-            "Comunicación Social": 5,
-            "Periodismo": 5,
-            "Derecho": 5,
-            "Licenciatura en Psicología": 5,
-            "Licenciatura en Lenguas Extranjeras": 5,
-            "Licenciatura en Letras": 5,
-            "Licenciatura en Historia del Arte": 5,
-            "Licenciatura en Geografía": 5,
-            "Licenciatura en Farmacia": 5,
-            "Licenciatura en Ciencia de los Alimentos": 5,
-            "Diseño Industrial": 5,
-            "Diseño de Comunicación Visual": 5,
-            "Preservación y Gestión del Patrimonio Cultural": 5,
-            "Licenciatura en Economía": 5,
-            "Licenciatura en Administración de Empresas": 5,
-            "Licenciatura en Contabilidad y Finanzas": 5,
-        }
-
-        descriptions = {
-            "Matemática": "Formación sólida en matemáticas puras y aplicadas, preparando para investigación y aplicación en diversas áreas científicas y tecnológicas.",
-            "Ciencias de la Computación": "Formación en fundamentos teóricos y prácticos de la computación, algoritmos, sistemas y desarrollo de software.",
-            "Ciencia de Datos": "Formación interdisciplinaria en matemáticas, estadística y computación para extraer conocimiento de datos complejos.",
-            "Licenciatura en Física": "Formación en leyes fundamentales de la naturaleza, métodos experimentales y aplicaciones tecnológicas.",
-            "Ingeniería Física": "Aplicación de principios físicos al diseño y desarrollo de tecnologías y sistemas innovadores.",
-            "Licenciatura en Química": "Estudio de la composición, propiedades y transformaciones de la materia, con aplicaciones industriales y ambientales.",
-        }
-
-        default_desc = f"Carrera de {career} en la facultad de {faculty}, formando profesionales con excelencia académica y preparación integral."
-
+        career_info = catalog.career(faculty, career)
         return {
-            "description": descriptions.get(career, default_desc),
-            "duration": durations.get(career, 5),
+            "description": career_info["description"],
+            "duration": career_info["duration"],
             "degree": "Licenciado/a"
             if "Licenciatura" in career
             else "Ingeniero/a"
@@ -1274,87 +1256,12 @@ class FacultyDashboardView:
     @staticmethod
     def get_career_subjects(faculty, career):
         """Get main subjects for a career"""
-        subjects_by_career = {
-            "Matemática": [
-                "Análisis Matemático I-IV",
-                "Álgebra Lineal y Abstracta",
-                "Geometría Diferencial",
-                "Ecuaciones Diferenciales",
-                "Análisis Numérico",
-                "Topología",
-            ],
-            "Ciencias de la Computación": [
-                "Algoritmos y Estructuras de Datos",
-                "Bases de Datos Avanzadas",
-                "Sistemas Operativos",
-                "Redes de Computadoras",
-                "Inteligencia Artificial",
-                "Ingeniería de Software",
-            ],
-            "Ciencia de Datos": [
-                "Estadística Matemática",
-                "Machine Learning",
-                "Visualización de Datos",
-                "Big Data y Cloud Computing",
-                "Minería de Datos",
-                "Procesamiento de Lenguaje Natural",
-            ],
-            "Licenciatura en Física": [
-                "Mecánica Clásica",
-                "Electromagnetismo",
-                "Termodinámica y Mecánica Estadística",
-                "Mecánica Cuántica",
-                "Física del Estado Sólido",
-                "Óptica y Fotónica",
-            ],
-        }
-
-        default_subjects = [
-            "Fundamentos de la Carrera",
-            "Metodología de la Investigación",
-            "Taller de Integración Profesional",
-            "Práctica Profesional Supervisada",
-            "Trabajo de Diploma o Tesis",
-        ]
-
-        return subjects_by_career.get(career, default_subjects)
+        return catalog.career(faculty, career)["subjects"]
 
     @staticmethod
     def get_graduate_profile(faculty, career):
         """Get graduate profile points for a career"""
-        profiles = {
-            "Matemática": [
-                "Capacidad para modelar y resolver problemas matemáticos complejos en diversos contextos",
-                "Habilidades avanzadas en análisis matemático, álgebra y geometría",
-                "Competencia en métodos matemáticos aplicados a ciencias, ingeniería y tecnología",
-                "Capacidad para investigación matemática pura y aplicada de alto nivel",
-                "Habilidades para la docencia y transferencia de conocimiento matemático",
-            ],
-            "Ciencias de la Computación": [
-                "Desarrollo de software robusto, escalable y de alta calidad",
-                "Diseño y análisis de algoritmos eficientes para problemas complejos",
-                "Administración y configuración de sistemas computacionales y redes",
-                "Implementación y gestión de bases de datos seguras y eficientes",
-                "Gestión de proyectos de desarrollo tecnológico e innovación",
-            ],
-            "Ciencia de Datos": [
-                "Extracción de insights valiosos y conocimiento de datos complejos y masivos",
-                "Implementación de modelos de machine learning y aprendizaje automático",
-                "Visualización efectiva y comunicativa de información y resultados",
-                "Gestión integral de proyectos de análisis de datos y business intelligence",
-                "Comunicación de resultados técnicos a audiencias técnicas y no técnicas",
-            ],
-        }
-
-        default_profile = [
-            "Formación integral en los fundamentos teóricos y prácticos de la disciplina",
-            "Capacidad para investigación científica básica y aplicada de calidad",
-            "Habilidades para el trabajo en equipo multidisciplinario y colaborativo",
-            "Competencia para la identificación y resolución de problemas complejos",
-            "Compromiso ético, responsabilidad social y profesionalismo",
-        ]
-
-        return profiles.get(career, default_profile)
+        return catalog.career(faculty, career)["graduate_profile"]
 
 
 class EvaluationView:
@@ -1373,6 +1280,12 @@ class EvaluationView:
             st.warning(f"Los {user_role} no pueden realizar evaluaciones.")
             return
 
+        EvaluationView.semester_evaluation_form()
+
+    @staticmethod
+    @st.fragment
+    def semester_evaluation_form():
+        """Semester form; submitting reruns only this fragment"""
         # Categories with detailed tooltips
         categories = [
             "Respeto a los horarios",
@@ -1486,6 +1399,12 @@ class EvaluationView:
             st.warning(f"Los {user_role} no pueden realizar evaluaciones.")
             return
 
+        EvaluationView.class_evaluation_form()
+
+    @staticmethod
+    @st.fragment
+    def class_evaluation_form():
+        """Class form; submitting reruns only this fragment"""
         with st.form("class_evaluation", clear_on_submit=False):
             # Class selection
             # col1, col2 = st.columns(2)
@@ -1652,6 +1571,16 @@ class CommentsView:
     def render():
         DashboardComponents.create_header("Comentarios", "💬")
 
+        CommentsView.render_comment_list()
+
+        # Add new comment
+        if st.session_state.user_role not in ["invitado", "administrador"]:
+            CommentsView.render_new_comment_form()
+
+    @staticmethod
+    @st.fragment
+    def render_comment_list():
+        """Filters and the comments they select; reruns on its own"""
         # Filters
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1670,7 +1599,10 @@ class CommentsView:
         # Comments list
         st.subheader("Comentarios de Estudiantes")
 
-        for comment in st.session_state.comments:
+        sample_comments = registry.get(
+            registry.SAMPLE_COMMENTS, AuthenticationManager.load_sample_comments
+        )
+        for comment in [*st.session_state.my_comments, *sample_comments]:
             # Apply filters
             if filter_faculty != "Todas" and comment["facultad"] != filter_faculty:
                 continue
@@ -1689,48 +1621,47 @@ class CommentsView:
 
             st.divider()
 
-        # Add new comment
-        if st.session_state.user_role not in ["invitado", "administrador"]:
-            with st.expander("➕ Agregar Comentario"):
-                with st.form("new_comment"):
-                    comment_class = st.selectbox(
-                        "Clase",
-                        [
-                            "Visualización de Datos",
-                            "Programación",
-                            "Matemáticas",
-                            "Estadística",
-                        ],
+    @staticmethod
+    def render_new_comment_form():
+        """Form for students to publish a comment"""
+        with st.expander("➕ Agregar Comentario"):
+            with st.form("new_comment"):
+                comment_class = st.selectbox(
+                    "Clase",
+                    [
+                        "Visualización de Datos",
+                        "Programación",
+                        "Matemáticas",
+                        "Estadística",
+                    ],
+                )
+                comment_text = st.text_area("Tu comentario", height=100)
+                # rating = st.slider("Calificación (opcional)", 1, 10, 6)
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    submitted = st.form_submit_button(
+                        "📤 Publicar", use_container_width=True
                     )
-                    comment_text = st.text_area("Tu comentario", height=100)
-                    # rating = st.slider("Calificación (opcional)", 1, 10, 6)
-
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        submitted = st.form_submit_button(
-                            "📤 Publicar", use_container_width=True
-                        )
-                    with col2:
-                        if st.form_submit_button(
-                            "❌ Cancelar", use_container_width=True
-                        ):
-                            st.rerun()
-
-                    if submitted and comment_text:
-                        new_comment = {
-                            "estudiante": st.session_state.current_user,
-                            "facultad": st.session_state.user_faculty,
-                            "carrera": st.session_state.user_career,
-                            "clase": comment_class,
-                            "profesor": "Dr. Marlon Castro",
-                            "comentario": comment_text,
-                            "calificacion": None,
-                            "fecha": datetime.now().strftime("%Y-%m-%d"),
-                        }
-                        st.session_state.comments.insert(0, new_comment)
-                        st.success("✅ Comentario publicado")
+                with col2:
+                    if st.form_submit_button("❌ Cancelar", use_container_width=True):
                         st.rerun()
 
+                if submitted and comment_text:
+                    new_comment = {
+                        "estudiante": st.session_state.current_user,
+                        "facultad": st.session_state.user_faculty,
+                        "carrera": st.session_state.user_career,
+                        "clase": comment_class,
+                        "profesor": "Dr. Marlon Castro",
+                        "comentario": comment_text,
+                        "calificacion": None,
+                        "fecha": datetime.now().strftime("%Y-%m-%d"),
+                    }
+                    st.session_state.my_comments.insert(0, new_comment)
+                    st.success("✅ Comentario publicado")
+                    st.rerun()
+
 
 # ============================================================================
 # MAIN APPLICATION
@@ -1755,92 +1686,188 @@ class UniversityDashboard:
             # User info with career
             if st.session_state.logged_in:
                 st.markdown(
-                    f"""
-                    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                             padding: 1rem; border-radius: 10px; color: white; margin-bottom: 1rem;'>
-                        <h3 style='margin: 0;'>{st.session_state.current_user}</h3>
-                        <p style='margin: 5px 0; opacity: 0.9;'>
-                            <strong>Rol:</strong> {st.session_state.user_role.capitalize()}
-                        </p>
-                        <p style='margin: 5px 0; opacity: 0.9;'>
-                            <strong>Facultad:</strong> {st.session_state.user_faculty}
-                        </p>
-                        <p style='margin: 5px 0; opacity: 0.9;'>
-                            <strong>Carrera:</strong> {st.session_state.user_career}
-                        </p>
-                    </div>
-                    """,
+                    f"<div class='uh-profile'><h3>{st.session_state.current_user}</h3>"
+                    f"<p><strong>Rol:</strong> "
+                    f"{st.session_state.user_role.capitalize()}</p>"
+                    f"<p><strong>Facultad:</strong> {st.session_state.user_faculty}</p>"
+                    f"<p><strong>Carrera:</strong> {st.session_state.user_career}</p>"
+                    "</div>",
                     unsafe_allow_html=True,
                 )
 
             # Navigation
             st.markdown("### Navegación")
 
-            # Get current page index
-            page_names = list(self.pages.keys())
-            current_page = st.session_state.current_page
-            current_index = (
-                page_names.index(current_page) if current_page in page_names else 0
-            )
-
-            selected_page = st.radio(
+            # The radio follows page changes made elsewhere (gallery, back)
+            st.session_state.nav_page = st.session_state.current_page
+            st.radio(
                 "Seleccionar página:",
-                options=page_names,
-                index=current_index,
+                options=list(self.pages.keys()),
+                key="nav_page",
+                on_change=Router.on_page_selected,
                 label_visibility="collapsed",
             )
 
-            # Update session state if page changed
-            if selected_page != st.session_state.current_page:
-                st.session_state.current_page = selected_page
-                st.rerun()
-
             st.divider()
 
             # Quick stats
             st.markdown("### 📈 Datos Rápidos")
-            try:
-                data = pd.read_csv("Semester_Rating.csv")
-                avg_rating = data.iloc[:, 1:].mean().mean()
-                st.metric("Calificación General", f"{avg_rating:.1f}/10")
-                st.metric("Total Facultades", len(data) - 1)
-            except:
-                st.metric("Calificación General", "4.2/10")
-                st.metric("Total Facultades", len(DataManager.get_faculties()))
+            kpis = metrics.kpis(DataManager.get_data())
+            st.metric(
+                "Calificación General",
+                metrics.format_kpi(kpis["overall_rating"], "{:.1f}/10"),
+            )
+            st.metric(
+                "Total Facultades", metrics.format_kpi(kpis["faculty_count"], "{}")
+            )
 
             st.divider()
 
+            if st.session_state.user_role == "administrador":
+                self.render_performance_panel()
+                st.divider()
+
             # Logout button
             if st.session_state.logged_in and st.button(
                 "🚪 Cerrar Sesión", use_container_width=True
             ):
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
+                AuthenticationManager.end_session()
                 st.rerun()
 
+    def render_performance_panel(self):
+        """Render per-rerun timings for administrators"""
+        import pandas as pd
+
+        with st.expander("⏱️ Rendimiento"):
+            st.checkbox(
+                "Medir memoria asignada",
+                value=tracemalloc.is_tracing(),
+                help="Activa tracemalloc para todo el proceso; añade sobrecarga.",
+                key="perf_trace_alloc",
+                on_change=lambda: profiling.set_alloc_tracing(
+                    st.session_state.perf_trace_alloc
+                ),
+            )
+
+            cache_stats = cache.stats()
+            st.caption(
+                f"Caché en memoria: {cache_stats['hits']} aciertos, "
+                f"{cache_stats['misses']} fallos, "
+                f"{cache_stats['computed']} cálculos, "
+                f"{cache_stats['coalesced']} cálculos duplicados evitados, "
+                f"{cache_stats['stale']} respuestas mientras se recalculaba, "
+                f"{cache_stats['evictions']} desalojos"
+            )
+            if cachedb.enabled():
+                disk_stats = cachedb.stats()
+                st.caption(
+                    f"Caché en disco: {disk_stats['hits']} aciertos, "
+                    f"{disk_stats['misses']} fallos, "
+                    f"{disk_stats['stores']} escrituras, "
+                    f"{disk_stats['evictions']} desalojos, "
+                    f"{disk_stats['expired']} caducadas, "
+                    f"{disk_stats['errors']} errores"
+                )
+
+            last_run = st.session_state.get("perf_last_run")
+            if not last_run or not last_run["calls"]:
+                st.caption("Sin mediciones todavía")
+                return
+
+            st.caption(
+                f"Última ejecución ({last_run['page']}): "
+                f"{last_run['wall_ms']:.0f} ms, CPU {last_run['cpu_ms']:.0f} ms"
+            )
+            table = pd.DataFrame.from_dict(last_run["calls"], orient="index")
+            table = table.sort_values("wall_ms", ascending=False).rename(
+                columns={
+                    "calls": "Llamadas",
+                    "wall_ms": "Tiempo (ms)",
+                    "cpu_ms": "CPU (ms)",
+                    "alloc_kb": "Memoria (KB)",
+                }
+            )
+            st.table(table.head(15))
+
     def run(self):
         """Run the main application"""
+        # A new session opens the page in the URL (deep links, reloads)
+        if "session_id" not in st.session_state:
+            Router.open_from_url()
+
         # Initialize session state
         AuthenticationManager.init_session_state()
+        # A reload keeps the URL: resume the session in this same run
+        if not st.session_state.logged_in:
+            AuthenticationManager.restore_session()
+        else:
+            AuthenticationManager.refresh_session()
 
-        # Load data
-        if not st.session_state.get("data"):
-            st.session_state.data = DataManager.load_data()
+        page = st.session_state.current_page if st.session_state.logged_in else "Login"
+        profiling.start_run(st.session_state.session_id, page)
+        try:
+            # A dataset reloaded mid-run is only seen from the next run
+            with registry.pinned():
+                self.render()
+        finally:
+            st.session_state.perf_last_run = profiling.finish_run()
+
+    def render(self):
+        """Render the current page"""
+        # Re-bake static chart images if Semester_Rating.csv changed
+        prerender.ensure_current()
 
         # Show login or main app
         if not st.session_state.logged_in:
             LoginView.render()
         else:
+            # Load the shared datasets once per process
+            DataManager.get_data()
+
             self.render_sidebar()
 
             # Render selected page
             page_func = self.pages.get(st.session_state.current_page)
             if page_func:
                 page_func()
+                Router.publish()
             else:
                 st.warning("Página no encontrada")
 
 
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+for _view in (
+    DataManager,
+    AuthenticationManager,
+    DashboardComponents,
+    LoginView,
+    MainDashboardView,
+    FacultyDashboardView,
+    EvaluationView,
+    CommentsView,
+):
+    profiling.instrument_class(_view)
+
+# plots is imported lazily by the views, so it is wrapped from the rerun
+# after its first use
+if "plots" in sys.modules:
+    profiling.instrument_module(
+        sys.modules["plots"],
+        [
+            "color_legend",
+            "rating_pie",
+            "rating_hist",
+            "fac_avrg",
+            "mark_hist",
+            "matr_pie",
+            "encode",
+        ],
+    )
+
+
 # ============================================================================
 # APPLICATION ENTRY POINT
 # ============================================================================
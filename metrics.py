@@ -0,0 +1,49 @@
+# Global KPIs shown in the sidebar and on the main dashboard
+#
+# They only depend on the shared datasets, so they are computed once per
+# data version (DataManager's content hash) and served from the shared
+# cache afterwards. A KPI whose source is missing or unusable is None.
+import math
+
+import cache
+
+
+def _number(value):
+    """float(value), or None for NaN"""
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def compute(data):
+    """Compute every KPI from the datasets"""
+    kpis = {
+        "overall_rating": None,
+        "faculty_count": None,
+        "student_count": None,
+        "average_grade": None,
+    }
+    try:
+        semester = data["semester_ratings"]
+        kpis["overall_rating"] = _number(semester.iloc[:, 1:].mean().mean())
+        kpis["faculty_count"] = int((semester["Facultad"] != "GENERAL").sum())
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        kpis["student_count"] = int(data["student_ratings"]["ID_Estudiante"].nunique())
+    except KeyError:
+        pass
+    try:
+        kpis["average_grade"] = _number(data["matcom_classes"]["Nota"].mean())
+    except (KeyError, TypeError):
+        pass
+    return kpis
+
+
+def kpis(data):
+    """KPIs for a version of the datasets"""
+    return cache.get_or_compute(("kpis", data["version"]), lambda: compute(data))
+
+
+def format_kpi(value, pattern):
+    """Format a KPI, or a dash when it is unavailable"""
+    return "—" if value is None else pattern.format(value)
@@ -1,10 +1,14 @@
 # Updated plots.py - removing broken functions
-from cProfile import label
+import base64
+import io
+import re
+import threading
 
 import matplotlib as mpl
 import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 
 colors = ["#f00", "#ce0", "#0a0"]
 gb_cmap = mcolors.LinearSegmentedColormap.from_list("my_cmap", colors, 10)
@@ -16,6 +20,22 @@ mpl.rcParams["font.sans-serif"] = [
     "DejaVu Sans",
 ]
 
+# SVG output: keep text as <text> elements (no embedded glyph paths) and use
+# a fixed hash salt so element ids are stable between renders
+mpl.rcParams["svg.fonttype"] = "none"
+mpl.rcParams["svg.hashsalt"] = "dashboard-uh"
+
+# Same resolution and cropping st.pyplot uses for its PNGs
+PNG_DPI = 200
+SVG_PRECISION = 1
+
+# Chart name -> format that produced the smaller payload last time
+_format_choice = {}
+
+# pyplot keeps a global "current figure"; hold this while building and
+# encoding outside the script thread (e.g. prefetching)
+figure_lock = threading.RLock()
+
 
 def crplot(rows=1, cols=1, figsize=(8, 8)):
     """Create a clean plot with transparent background"""
@@ -43,6 +63,72 @@ def crplot(rows=1, cols=1, figsize=(8, 8)):
     return fig, ax
 
 
+def encode_png(fig, dpi=PNG_DPI) -> bytes:
+    """Encode a figure as PNG bytes"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def encode_svg(fig, precision=SVG_PRECISION) -> str:
+    """Encode a figure as minified SVG text with rounded coordinates"""
+    buffer = io.StringIO()
+    fig.savefig(
+        buffer,
+        format="svg",
+        bbox_inches="tight",
+        metadata={"Creator": None, "Date": None, "Format": None, "Type": None},
+    )
+    svg = buffer.getvalue()
+
+    # Drop the XML prolog, doctype, comments and metadata block
+    svg = svg[svg.index("<svg") :]
+    svg = re.sub(r"<!--.*?-->", "", svg, flags=re.DOTALL)
+    svg = re.sub(r"<metadata>.*?</metadata>", "", svg, flags=re.DOTALL)
+
+    # Inside tags (not text content): round decimals, strip trailing zeros
+    # and squeeze whitespace
+    def _round(match):
+        value = round(float(match.group(0)), precision)
+        text = f"{value:.{precision}f}".rstrip("0").rstrip(".")
+        return "0" if text in ("-0", "") else text
+
+    def _minify_tag(tag):
+        tag = re.sub(r"-?\d+\.\d+", _round, tag.group(0))
+        tag = re.sub(r"\s+", " ", tag)
+        return re.sub(r' "', '"', tag)
+
+    svg = re.sub(r"<[^>]+>", _minify_tag, svg)
+    svg = re.sub(r">\s+<", "><", svg)
+    return svg.strip()
+
+
+def encode(fig, fmt="auto", name=None):
+    """Encode a figure for st.image, returning (format, payload)
+
+    With fmt="auto" both encodings are produced and the smaller one is kept.
+    When a chart name is given the winning format is remembered, so later
+    renders of the same chart only pay for one encoding.
+    """
+    if fmt == "auto" and name in _format_choice:
+        fmt = _format_choice[name]
+
+    if fmt == "png":
+        return "png", encode_png(fig)
+    if fmt == "svg":
+        return "svg", encode_svg(fig)
+
+    png = encode_png(fig)
+    svg = encode_svg(fig)
+    # SVG strings reach the browser as base64 data URIs (4/3 overhead),
+    # PNG bytes are served as-is by the media file manager
+    svg_size = len(base64.b64encode(svg.encode("utf-8")))
+    choice = ("svg", svg) if svg_size < len(png) else ("png", png)
+    if name is not None:
+        _format_choice[name] = choice[0]
+    return choice
+
+
 def color_legend():
     """Create a color legend for ratings"""
     fig, ax = crplot(figsize=(14, 1))
@@ -247,7 +333,3 @@ def matr_pie(data: dict, colors: list[str] = None):
         fontweight="bold",
     )
     return fig, ax
-
-
-# Import pandas if needed for type checking
-import pandas as pd
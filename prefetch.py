@@ -0,0 +1,63 @@
+# Background warm-up for the faculties a user is likely to open next
+#
+# While a faculty page is on screen, the view asks for the aggregates and
+# charts of the user's own faculty, the recently viewed ones and the list
+# neighbours. A single worker thread computes them into cache, so that
+# switching faculty only reads cached values. The same worker recomputes
+# entries that cache.get_or_stale is serving stale. Jobs see the datasets of
+# the run that scheduled them, matching the data version in their keys.
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cache
+import registry
+
+RECENT_LIMIT = 5
+
+logger = logging.getLogger(__name__)
+
+# One worker keeps prefetching from competing with live reruns for the CPU
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+_pending = set()
+_lock = threading.Lock()
+
+
+def likely_next(current, faculties, own=None, recent=()):
+    """Faculties worth warming while `current` is shown, most likely first"""
+    candidates = [own, *recent]
+    if current in faculties:
+        index = faculties.index(current)
+        candidates += [faculties[index - 1], faculties[(index + 1) % len(faculties)]]
+
+    ordered = []
+    for faculty in candidates:
+        if faculty in faculties and faculty != current and faculty not in ordered:
+            ordered.append(faculty)
+    return ordered
+
+
+def remember(recent, faculty):
+    """Recently viewed list with faculty moved to the front"""
+    return [faculty, *(f for f in recent if f != faculty)][:RECENT_LIMIT]
+
+
+def schedule(key, compute, family=None):
+    """Compute key into the cache in the background unless already there"""
+    with _lock:
+        if key in _pending or cache.contains(key):
+            return
+        _pending.add(key)
+    _executor.submit(_run, key, compute, family, registry.snapshot())
+
+
+def _run(key, compute, family, values):
+    try:
+        with registry.pinned(values):
+            cache.get_or_compute(key, compute, family)
+    except Exception:
+        # The page computes the value itself when it needs it
+        logger.warning("Prefetch of %s failed", key, exc_info=True)
+    finally:
+        with _lock:
+            _pending.discard(key)
@@ -0,0 +1,259 @@
+# Pre-renders the charts that only depend on Semester_Rating.csv
+#
+#   python prerender.py            render if the data changed
+#   python prerender.py --force    render everything again
+#   python prerender.py --workers 4
+#
+# Runs are serialized host-wide by LOCK_FILE: every Streamlit worker may
+# start a job after a data change, but they take turns, and a job that
+# finds the manifest already current exits. A job only publishes charts
+# for the data as it still is when it finishes; if the file changed while
+# it rendered, it renders again.
+#
+# Charts go to static/charts/<stamp>/, which Streamlit serves at
+# /app/static/charts/<stamp>/ (see assets.py), so pages only send their
+# URL. The stamp in the path means a URL never changes meaning: the proxy
+# can cache /app/static/charts/ like the other hashed assets.
+#
+# A background job that fails is logged with the end of its stderr, and
+# its stamp is not tried again by that worker until the data changes.
+import argparse
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import assets
+import cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: no host-wide lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FILE = "Semester_Rating.csv"
+ASSET_DIR = assets.STATIC_DIR / "charts"
+MANIFEST_FILE = ASSET_DIR / "manifest.json"
+LOCK_FILE = ASSET_DIR / ".prerender.lock"
+# Characters of a failed job's stderr worth logging
+ERROR_TAIL = 2000
+
+# (mtime, size) -> content stamp, so reruns don't hash the file every time
+_stamp_cache = {}
+# (mtime, size) -> parsed manifest
+_manifest_cache = {}
+# Stamps for which a background job was already started by this process,
+# whether it succeeded or not
+_triggered = set()
+# stamp -> (running job, its stderr file), reaped by ensure_current
+_jobs = {}
+_trigger_lock = threading.Lock()
+
+
+def data_stamp(path=SOURCE_FILE):
+    """Short content hash of the source data file, or None if missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _stamp_cache:
+        with open(path, "rb") as source:
+            _stamp_cache[key] = hashlib.sha256(source.read()).hexdigest()[:12]
+    return _stamp_cache[key]
+
+
+def chart_jobs(path=SOURCE_FILE):
+    """List (chart, builder, argument) for every static chart"""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    ratings = df.set_index("Facultad")
+
+    # Same aggregates the views compute
+    jobs = [
+        ("color_legend", "color_legend", None),
+        ("general_pie", "rating_pie", float(df.iloc[:, 1:].mean().mean())),
+        ("general_hist", "rating_hist", df.iloc[:, 1:].mean().to_dict()),
+        ("fac_avrg", "fac_avrg", ratings.to_dict(orient="index")),
+    ]
+    for faculty, row in ratings.iterrows():
+        if faculty == "GENERAL":
+            continue
+        jobs.append((f"{faculty}_pie", "rating_pie", float(row.mean())))
+        jobs.append((f"{faculty}_hist", "rating_hist", row.to_dict()))
+    return jobs
+
+
+def render_job(chart, builder, argument, stamp):
+    """Render one chart into the stamp's directory; return its static path"""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    import plots
+
+    if builder == "color_legend":
+        fig, _ = plots.color_legend()
+    elif builder == "rating_pie":
+        fig, _ = plots.rating_pie(argument)
+    elif builder == "rating_hist":
+        fig, _ = plots.rating_hist(pd.Series(argument))
+    elif builder == "fac_avrg":
+        fig, _ = plots.fac_avrg(pd.DataFrame.from_dict(argument, orient="index"))
+    else:
+        raise ValueError(f"Unknown chart builder: {builder}")
+
+    fmt, payload = plots.encode(fig)
+    plt.close(fig)
+
+    path = ASSET_DIR / stamp / f"{chart}.{fmt}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if fmt == "svg":
+        tmp_path.write_text(payload, encoding="utf-8")
+    else:
+        tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+    return chart, path.relative_to(assets.STATIC_DIR).as_posix()
+
+
+def load_manifest():
+    """Return the current manifest, or an empty one"""
+    try:
+        stat = MANIFEST_FILE.stat()
+    except OSError:
+        return {"stamp": None, "charts": {}}
+    key = (stat.st_mtime_ns, stat.st_size)
+    if key not in _manifest_cache:
+        _manifest_cache.clear()
+        _manifest_cache[key] = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+    return _manifest_cache[key]
+
+
+@contextlib.contextmanager
+def host_lock():
+    """Hold LOCK_FILE, waiting for any other pre-render job on the host"""
+    ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def prerender(force=False, workers=None):
+    """Render every static chart in parallel if the data changed"""
+    with host_lock():
+        while True:
+            stamp = data_stamp()
+            if stamp is None:
+                raise FileNotFoundError(SOURCE_FILE)
+
+            manifest = load_manifest()
+            if manifest["stamp"] == stamp and not force:
+                return manifest
+
+            jobs = chart_jobs()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(render_job, *job, stamp) for job in jobs]
+                charts = dict(future.result() for future in futures)
+
+            if data_stamp() == stamp:
+                return publish(stamp, charts)
+            # The data changed while rendering: render the new version
+            force = False
+
+
+def publish(stamp, charts):
+    """Publish the manifest atomically, then drop other stamps' directories"""
+    manifest = {"stamp": stamp, "charts": charts}
+    tmp_manifest = MANIFEST_FILE.with_suffix(".json.tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_manifest, MANIFEST_FILE)
+
+    for path in ASSET_DIR.iterdir():
+        if path.is_dir() and path.name != stamp:
+            shutil.rmtree(path, ignore_errors=True)
+    return manifest
+
+
+def chart_url(chart):
+    """URL of a pre-rendered chart for the current data, or None
+
+    While the background job re-renders after a data change, the previous
+    charts are served for up to cache.MAX_STALE_SECONDS.
+    """
+    manifest = load_manifest()
+    if manifest["stamp"] is None:
+        return None
+    if manifest["stamp"] != data_stamp() and not within_grace():
+        return None
+    path = manifest["charts"].get(chart)
+    if path is None or not (assets.STATIC_DIR / path).exists():
+        return None
+    return assets.static_url(path)
+
+
+def within_grace(path=SOURCE_FILE):
+    """True if the source changed recently enough to serve stale charts"""
+    try:
+        changed = os.stat(path).st_mtime
+    except OSError:
+        return False
+    return time.time() - changed <= cache.MAX_STALE_SECONDS
+
+
+def ensure_current():
+    """Start the pre-render job in the background when the data changed"""
+    if _jobs:
+        with _trigger_lock:
+            for job_stamp, (job, errors) in list(_jobs.items()):
+                if job.poll() is None:
+                    continue
+                del _jobs[job_stamp]
+                with errors:
+                    if job.returncode != 0:
+                        # Stays in _triggered: data that does not render
+                        # would fail the same way on every rerun
+                        errors.seek(0)
+                        logger.error(
+                            "Pre-render job for %s failed (exit code %s):\n%s",
+                            job_stamp,
+                            job.returncode,
+                            errors.read()[-ERROR_TAIL:].decode(errors="replace"),
+                        )
+
+    stamp = data_stamp()
+    if stamp is None or load_manifest()["stamp"] == stamp:
+        return
+    with _trigger_lock:
+        if stamp in _triggered:
+            return
+        _triggered.add(stamp)
+        # A file rather than a pipe: nothing reads it while the job runs
+        errors = tempfile.TemporaryFile()
+        job = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdout=subprocess.DEVNULL,
+            stderr=errors,
+        )
+        _jobs[stamp] = (job, errors)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render static charts")
+    parser.add_argument("--force", action="store_true", help="render even if current")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+
+    manifest = prerender(force=args.force, workers=args.workers)
+    print(f"✅ {len(manifest['charts'])} gráficos en {ASSET_DIR} ({manifest['stamp']})")
@@ -0,0 +1,163 @@
+# Per-rerun render instrumentation
+#
+# Every wrapped call records wall time, CPU time of the script thread, call
+# count and (when allocation tracing is on) net bytes allocated. With
+# DASHBOARD_PERF_LOG set (e.g. to perf/metrics.jsonl), each rerun is also
+# appended as one JSON line to that file for offline analysis:
+#
+#   pandas.read_json("perf/metrics.jsonl", lines=True)
+#
+# Once the file passes PERF_LOG_MAX_BYTES it is renamed to <file>.1 (the
+# previous .1 is dropped) and a new one is started.
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Off unless DASHBOARD_PERF_LOG names a file
+PERF_LOG = os.environ.get("DASHBOARD_PERF_LOG", "")
+PERF_LOG_MAX_BYTES = 16 * 1024 * 1024
+
+_local = threading.local()
+_log_lock = threading.Lock()
+_runs_started = 0
+
+
+class RunRecorder:
+    """Collects timings for a single script run"""
+
+    def __init__(self, session, page):
+        self.session = session
+        self.page = page
+        self.calls = {}
+        self.started = datetime.now()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def add(self, name, wall, cpu, alloc):
+        stats = self.calls.setdefault(
+            name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "alloc_kb": None}
+        )
+        stats["calls"] += 1
+        stats["wall_ms"] += wall * 1000
+        stats["cpu_ms"] += cpu * 1000
+        if alloc is not None:
+            stats["alloc_kb"] = (stats["alloc_kb"] or 0.0) + alloc / 1024
+
+    def summary(self):
+        return {
+            "ts": self.started.isoformat(timespec="seconds"),
+            "session": self.session,
+            "page": self.page,
+            "wall_ms": round((time.perf_counter() - self.wall_start) * 1000, 2),
+            "cpu_ms": round((time.thread_time() - self.cpu_start) * 1000, 2),
+            "calls": {
+                name: {
+                    key: round(value, 2) if isinstance(value, float) else value
+                    for key, value in stats.items()
+                }
+                for name, stats in self.calls.items()
+            },
+        }
+
+
+def start_run(session, page):
+    """Begin recording a script run on the current thread"""
+    global _runs_started
+
+    with _log_lock:
+        _runs_started += 1
+    _local.recorder = RunRecorder(session, page)
+
+
+def run_count():
+    """Script runs started in this process, including ones cut by st.rerun"""
+    return _runs_started
+
+
+def finish_run():
+    """Stop recording, export the run and return its summary"""
+    recorder = getattr(_local, "recorder", None)
+    _local.recorder = None
+    if recorder is None:
+        return None
+
+    summary = recorder.summary()
+    if PERF_LOG:
+        path = Path(PERF_LOG)
+        line = json.dumps(summary, ensure_ascii=False)
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as log:
+                log.write(line + "\n")
+                rotate = log.tell() > PERF_LOG_MAX_BYTES
+            if rotate:
+                os.replace(path, path.with_name(path.name + ".1"))
+    return summary
+
+
+def set_alloc_tracing(enabled):
+    """Turn allocation tracing on or off (costly, process-wide)"""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def timed(name):
+    """Decorator recording a call into the current run, if any"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = getattr(_local, "recorder", None)
+            if recorder is None:
+                return func(*args, **kwargs)
+
+            tracing = tracemalloc.is_tracing()
+            alloc_start = tracemalloc.get_traced_memory()[0] if tracing else 0
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                alloc = (
+                    tracemalloc.get_traced_memory()[0] - alloc_start
+                    if tracing and tracemalloc.is_tracing()
+                    else None
+                )
+                recorder.add(
+                    name,
+                    time.perf_counter() - wall_start,
+                    time.thread_time() - cpu_start,
+                    alloc,
+                )
+
+        wrapper.__timed__ = True
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls):
+    """Wrap every public static method of a class"""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not isinstance(value, staticmethod):
+            continue
+        if getattr(value.__func__, "__timed__", False):
+            continue
+        setattr(
+            cls, attr, staticmethod(timed(f"{cls.__name__}.{attr}")(value.__func__))
+        )
+
+
+def instrument_module(module, names):
+    """Wrap module-level functions; safe to call on every rerun"""
+    for attr in names:
+        func = getattr(module, attr)
+        if not getattr(func, "__timed__", False):
+            setattr(module, attr, timed(f"{module.__name__}.{attr}")(func))
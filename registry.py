@@ -0,0 +1,78 @@
+# Process-wide, read-only data shared by every session
+#
+# st.session_state is per browser tab, so anything kept there is duplicated
+# for every connected user. Data that is the same for everyone (datasets,
+# sample comments, the faculty catalog) lives here instead: loaded once per
+# process, looked up by key, and frozen so a session cannot change it for
+# the others. Sessions keep only small per-user state.
+#
+# DataFrames cannot be frozen; treat them as read-only and copy before
+# modifying.
+#
+# A new version of a value is built on the side and then swapped in. A
+# script run inside pinned() keeps seeing the values that were current when
+# it started, so a swap never mixes two versions in one page.
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+
+DATASETS = "datasets"
+SAMPLE_COMMENTS = "sample_comments"
+CATALOG = "catalog"
+
+_entries = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def freeze(value):
+    """Read-only view of dicts and lists, recursively"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def get(key, loader):
+    """Shared value for key, built with loader() on first use"""
+    snapshot = getattr(_local, "snapshot", None)
+    if snapshot is not None and key in snapshot:
+        return snapshot[key]
+    try:
+        value = _entries[key]
+    except KeyError:
+        with _lock:
+            if key not in _entries:
+                _entries[key] = freeze(loader())
+            value = _entries[key]
+    if snapshot is not None:
+        snapshot[key] = value
+    return value
+
+
+def swap(key, value):
+    """Replace the value for key; pinned runs keep the one they started with"""
+    with _lock:
+        _entries[key] = freeze(value)
+
+
+def snapshot():
+    """The values this thread sees now, to pin other work to them"""
+    current = getattr(_local, "snapshot", None)
+    return dict(_entries if current is None else current)
+
+
+@contextmanager
+def pinned(values=None):
+    """Serve this thread the values current at entry (or given) until exit"""
+    _local.snapshot = dict(_entries) if values is None else dict(values)
+    try:
+        yield
+    finally:
+        _local.snapshot = None
+
+
+def shared_values():
+    """Every loaded value, e.g. to exclude them from per-session accounting"""
+    return list(_entries.values())
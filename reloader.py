@@ -0,0 +1,140 @@
+# Hot reload of the shared datasets when their files change
+#
+# DataManager registers the files behind a registry entry together with a
+# strict loader and a validator. One background thread watches them
+# (inotify through watchdog when it is installed, polling otherwise). When
+# a file changes and has stopped changing for SETTLE_SECONDS, the thread
+# loads a complete new version on the side, validates it and swaps it into
+# the registry, so every session gets the new data on its next run while
+# runs already in progress finish on the old one. A version that fails to
+# load or validate is logged and skipped; the old one stays in service.
+import logging
+import os
+import threading
+import time
+
+import registry
+
+POLL_SECONDS = 2.0
+# With inotify events the periodic check is only a safety net
+EVENT_POLL_SECONDS = 30.0
+SETTLE_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+_watches = {}
+_lock = threading.Lock()
+_wake = threading.Event()
+_thread = None
+
+
+class Watch:
+    """Files behind one registry entry and how to reload them"""
+
+    def __init__(self, key, paths, loader, validate):
+        self.key = key
+        self.paths = tuple(paths)
+        self.loader = loader
+        self.validate = validate
+        self.stamp = file_stamp(self.paths)
+        self.reloads = 0
+        self.failures = 0
+
+
+def file_stamp(paths):
+    """(mtime, size) of every path, None for missing files"""
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def watch(key, paths, loader, validate=None):
+    """Reload registry entry key with loader() whenever a path changes"""
+    global _thread
+
+    if key in _watches:
+        return
+    with _lock:
+        if key in _watches:
+            return
+        _watches[key] = Watch(key, paths, loader, validate)
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="reloader", daemon=True)
+            _thread.start()
+
+
+def stats():
+    """key -> (reloads, failed reloads) since the process started"""
+    return {key: (w.reloads, w.failures) for key, w in _watches.items()}
+
+
+def check():
+    """Reload every entry whose files changed; True if any was swapped"""
+    swapped = False
+    for entry in list(_watches.values()):
+        stamp = file_stamp(entry.paths)
+        if stamp == entry.stamp:
+            continue
+
+        # Wait for a copy in progress to finish before reading
+        time.sleep(SETTLE_SECONDS)
+        settled = file_stamp(entry.paths)
+        if settled != stamp:
+            continue
+        entry.stamp = stamp
+
+        try:
+            value = entry.loader()
+            if entry.validate:
+                entry.validate(value)
+        except Exception:
+            entry.failures += 1
+            logger.exception("Reload of %s failed; keeping the old version", entry.key)
+            continue
+
+        registry.swap(entry.key, value)
+        entry.reloads += 1
+        swapped = True
+        logger.info("Reloaded %s", entry.key)
+    return swapped
+
+
+def _start_observer():
+    """Wake the watcher on inotify events; False if watchdog is missing"""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return False
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            _wake.set()
+
+    observer = Observer()
+    directories = {
+        os.path.dirname(os.path.abspath(path))
+        for entry in _watches.values()
+        for path in entry.paths
+    }
+    for directory in directories:
+        observer.schedule(Handler(), directory, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return True
+
+
+def _run():
+    interval = EVENT_POLL_SECONDS if _start_observer() else POLL_SECONDS
+    while True:
+        _wake.wait(interval)
+        _wake.clear()
+        try:
+            check()
+        except Exception:
+            logger.exception("Data reload check failed")
@@ -0,0 +1,159 @@
+# Signed, expiring login tokens that survive a browser reload
+#
+# A reload starts a new Streamlit session with empty session_state, but the
+# URL is kept. After a login the profile is put into the `s` query param as
+#
+#   base64url(json payload) "." base64url(hmac-sha256 signature)
+#
+# and the next session restores it with one HMAC check, without going back
+# through the login form. The key comes from DASHBOARD_SECRET, or from
+# session_secret.key (generated on first use, gitignored) so that every
+# worker on the host and every restart accepts the same tokens. Changing the
+# key logs everybody out.
+#
+# The token is a bearer credential sitting in a URL people may copy, so it
+# is kept short-lived: it expires after TOKEN_TTL, an active session swaps
+# it for a fresh one every ROTATE_SECONDS, and both rotation and logout
+# revoke the old one. Every token has a random id; revoked ids are kept in
+# REVOKED_FILE (SQLite, shared by the workers) until the token would have
+# expired anyway.
+import base64
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+QUERY_PARAM = "s"
+SECRET_FILE = "session_secret.key"
+REVOKED_FILE = "revoked_sessions.sqlite3"
+TOKEN_TTL = 30 * 60
+ROTATE_SECONDS = 5 * 60
+
+_secret = None
+_secret_lock = threading.Lock()
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def secret():
+    """Signing key: DASHBOARD_SECRET, else the key file (created if missing)"""
+    global _secret
+
+    if _secret is None:
+        with _secret_lock:
+            if _secret is None:
+                if os.environ.get("DASHBOARD_SECRET"):
+                    _secret = os.environ["DASHBOARD_SECRET"].encode("utf-8")
+                else:
+                    _secret = _load_or_create_key()
+    return _secret
+
+
+def _load_or_create_key():
+    try:
+        with open(SECRET_FILE, "rb") as key_file:
+            return key_file.read()
+    except FileNotFoundError:
+        pass
+
+    key = secrets.token_bytes(32)
+    try:
+        # O_EXCL: if another worker wins the race, use its key instead
+        fd = os.open(SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(SECRET_FILE, "rb") as key_file:
+            return key_file.read()
+    with os.fdopen(fd, "wb") as key_file:
+        key_file.write(key)
+    return key
+
+
+def _sign(payload):
+    return hmac.new(secret(), payload.encode("ascii"), hashlib.sha256).digest()
+
+
+def issue(profile, ttl=TOKEN_TTL):
+    """Token carrying profile, valid for ttl seconds"""
+    now = int(time.time())
+    data = {"p": profile, "id": secrets.token_urlsafe(9), "iat": now, "exp": now + ttl}
+    payload = _b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_b64encode(_sign(payload))}"
+
+
+def _claims(token):
+    """Payload of a genuine, unexpired token, or None"""
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(_b64decode(signature), _sign(payload)):
+            return None
+        data = json.loads(_b64decode(payload))
+    except (AttributeError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("exp", 0) < time.time():
+        return None
+    return data
+
+
+def _revocations():
+    """Connection to the revocation list, closed when the block ends"""
+    connection = sqlite3.connect(REVOKED_FILE, timeout=5, isolation_level=None)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS revoked (id TEXT PRIMARY KEY, expires REAL)"
+    )
+    return contextlib.closing(connection)
+
+
+def is_revoked(token_id):
+    """True if the token with this id was revoked"""
+    with _revocations() as connection:
+        row = connection.execute(
+            "SELECT 1 FROM revoked WHERE id = ?", (token_id,)
+        ).fetchone()
+    return row is not None
+
+
+def revoke(token):
+    """Stop accepting a token (and forget ids whose tokens have expired)"""
+    data = _claims(token)
+    if data is None or "id" not in data:
+        return
+    with _revocations() as connection:
+        connection.execute(
+            "INSERT OR IGNORE INTO revoked (id, expires) VALUES (?, ?)",
+            (data["id"], data["exp"]),
+        )
+        connection.execute("DELETE FROM revoked WHERE expires < ?", (time.time(),))
+
+
+def verify(token):
+    """Profile from a token, or None if forged, malformed, expired or revoked"""
+    data = _claims(token)
+    if data is None or "id" not in data or is_revoked(data["id"]):
+        return None
+    return data.get("p")
+
+
+def rotate(token, every=ROTATE_SECONDS):
+    """Token to keep using: token itself, a new one once it is `every`
+    seconds old, or None if it is forged, expired or revoked
+
+    The old token is revoked, so a copied URL stops working soon after.
+    """
+    data = _claims(token)
+    if data is None or "id" not in data or is_revoked(data["id"]):
+        return None
+    if time.time() - data.get("iat", 0) < every:
+        return token
+    revoke(token)
+    return issue(data["p"])
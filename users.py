@@ -0,0 +1,249 @@
+# User directory: the accounts that can log in
+#
+#   python users.py              build users.csv from Student_Ratings.csv
+#   python users.py --workers 8
+#
+# Every student in Student_Ratings.csv gets an account named after their ID
+# (lowercase) with a random initial password. The passwords are written to
+# initial_passwords.csv (username,password, the format benchmarks/loadgen.py
+# --users reads) for distribution; the roster itself only keeps salted
+# scrypt hashes. Both files are generated and gitignored. The demo account
+# names (admin included) are in the roster too, but with random passwords
+# like everyone else. Without a roster (or with DASHBOARD_USERS="") only
+# the demo accounts exist, with the passwords the login page shows.
+#
+# The roster is read once per process into a dict keyed by username.
+# Password checks run in a small thread pool: scrypt releases the GIL, and
+# the pool bounds how many hashes run at once, so a burst of logins cannot
+# take every core away from other sessions' reruns. At most MAX_PENDING
+# checks wait for it; past that, and when a check takes longer than
+# VERIFY_TIMEOUT, authenticate raises Busy and the user tries again.
+import argparse
+import base64
+import concurrent.futures
+import csv
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import catalog
+
+SOURCE_FILE = "Student_Ratings.csv"
+USERS_FILE = os.environ.get("DASHBOARD_USERS", "users.csv")
+PASSWORDS_FILE = "initial_passwords.csv"
+
+# scrypt cost: about 16 MB and a few tens of ms per hash
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+MAX_PENDING = HASH_WORKERS * 16
+VERIFY_TIMEOUT = 10
+
+PROFILE_FIELDS = ("nombre", "facultad", "carrera", "role")
+FIELDS = ("username", *PROFILE_FIELDS, "password_hash")
+
+# Public demo accounts, listed on the login page
+DEMO_USERS = {
+    "estudiante1": {
+        "password": "1234",
+        "nombre": "Juan Pérez",
+        "facultad": "MATCOM",
+        "carrera": "Ciencia de Datos",
+        "role": "estudiante",
+    },
+    "estudiante2": {
+        "password": "1234",
+        "nombre": "Ana Gómez",
+        "facultad": "FF",
+        "carrera": "Física",
+        "role": "estudiante",
+    },
+    "admin": {
+        "password": "admin123",
+        "nombre": "Administrador",
+        "facultad": "Todas",
+        "carrera": "Todas",
+        "role": "administrador",
+    },
+}
+
+_directory = None
+_demo = False
+_directory_lock = threading.Lock()
+_dummy_hash = None
+_verifier = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="login")
+_pending = threading.BoundedSemaphore(MAX_PENDING)
+
+
+class Busy(Exception):
+    """Too many logins at once: the password could not be checked in time"""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, salt=None):
+    """Salted scrypt hash, stored as scrypt$n$r$p$salt$digest"""
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P
+    )
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def check_password(password, stored):
+    """True if password matches a hash from hash_password"""
+    try:
+        scheme, n, r, p, salt, digest = stored.split("$")
+        if scheme != "scrypt":
+            return False
+        expected = base64.b64decode(digest)
+        computed = hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=base64.b64decode(salt),
+            n=int(n),
+            r=int(r),
+            p=int(p),
+            dklen=len(expected),
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(computed, expected)
+
+
+def demo_accounts():
+    """The demo users as roster entries"""
+    return {
+        username: {
+            "username": username,
+            **{key: value for key, value in user.items() if key != "password"},
+            "password_hash": hash_password(user["password"]),
+        }
+        for username, user in DEMO_USERS.items()
+    }
+
+
+def load_directory():
+    """username -> account, read from the roster once per process"""
+    global _demo, _directory
+
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                try:
+                    with open(USERS_FILE, newline="", encoding="utf-8") as roster:
+                        _directory = {
+                            row["username"].lower(): row
+                            for row in csv.DictReader(roster)
+                        }
+                except FileNotFoundError:
+                    _directory = demo_accounts()
+                    _demo = True
+    return _directory
+
+
+def demo_mode():
+    """True if only the demo accounts exist (no roster)"""
+    load_directory()
+    return _demo
+
+
+def find_user(username):
+    """Account for a username (case-insensitive), or None"""
+    return load_directory().get(username.strip().lower())
+
+
+def authenticate(username, password):
+    """(True, account without its hash) if the password matches
+
+    Raises Busy if the check is rejected or times out under load.
+    """
+    global _dummy_hash
+
+    account = find_user(username)
+    if account is None:
+        # Hash anyway, so unknown users take as long as wrong passwords
+        if _dummy_hash is None:
+            _dummy_hash = hash_password(secrets.token_hex(8))
+        stored = _dummy_hash
+    else:
+        stored = account["password_hash"]
+
+    if not _pending.acquire(blocking=False):
+        raise Busy
+    future = _verifier.submit(check_password, password, stored)
+    # The slot is freed when the check ends or is cancelled, not on timeout
+    future.add_done_callback(lambda _: _pending.release())
+    try:
+        matches = future.result(timeout=VERIFY_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise Busy from None
+    if account is None or not matches:
+        return False, None
+    return True, {key: value for key, value in account.items() if key in PROFILE_FIELDS}
+
+
+def build(workers=None):
+    """Write the roster and initial passwords for every student"""
+    import pandas as pd
+
+    students = pd.read_csv(
+        SOURCE_FILE, usecols=["ID_Estudiante", "Facultad", "Carrera"]
+    ).drop_duplicates("ID_Estudiante")
+
+    # The demo names keep their profiles but not their public passwords
+    accounts = [
+        {
+            "username": username,
+            "password": secrets.token_urlsafe(9),
+            **{key: user[key] for key in PROFILE_FIELDS},
+        }
+        for username, user in DEMO_USERS.items()
+    ]
+    for student in students.itertuples(index=False):
+        accounts.append(
+            {
+                "username": student.ID_Estudiante.lower(),
+                "password": secrets.token_urlsafe(9),
+                "nombre": student.ID_Estudiante,
+                "facultad": catalog.acronym(student.Facultad),
+                "carrera": student.Carrera,
+                "role": "estudiante",
+            }
+        )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = pool.map(
+            hash_password, [account["password"] for account in accounts], chunksize=64
+        )
+        for account, password_hash in zip(accounts, hashes):
+            account["password_hash"] = password_hash
+
+    for path, fields in (
+        (USERS_FILE, FIELDS),
+        (PASSWORDS_FILE, ("username", "password")),
+    ):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as output:
+            writer = csv.DictWriter(output, fields, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(accounts)
+        os.replace(tmp_path, path)
+    return len(accounts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the user roster")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    count = build(args.workers)
+    print(f"✅ {count} cuentas en {USERS_FILE}")
+    print(f"   - contraseñas iniciales en {PASSWORDS_FILE} (no subir al repositorio)")
@@ -0,0 +1,197 @@
+# Startup warm-up: fill the shared caches before the instance takes traffic
+#
+#   python warmup.py --serve                          warm up, then serve
+#   python warmup.py --serve -- --server.port 8080    streamlit run options
+#   python warmup.py --workers 4                      warm up only
+#
+# Loads the datasets and computes the global KPIs, every faculty's
+# aggregates and performance charts (into the disk tier of the cache, which
+# every Streamlit worker on the host reads), pre-renders the static charts
+# and builds the static assets and gallery cards, all in parallel. Then it
+# writes READY_FILE with the data version and how long the warm-up took.
+# READY_FILE is under static/, so Streamlit serves it at
+# /app/static/ready.json: point the load balancer's health check there and
+# it gets a 404 until the instance is warm.
+#
+# With --serve the file follows the server it describes: it is removed
+# when the warm-up starts, when the datasets change (and written again
+# once the new version is warm) and when the server stops. Exit code 1 if
+# a warm-up fails.
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import assets
+import prerender
+import reloader
+
+READY_FILE = assets.STATIC_DIR / "ready.json"
+
+
+def _load_app():
+    """Import the dashboard outside `streamlit run` (once per process)"""
+    import streamlit.logger
+    from streamlit import config
+
+    # Bare mode is intended here: no "streamlit run" or ScriptRunContext noise
+    config.set_option("global.showWarningOnDirectExecution", False)
+    streamlit.logger.set_log_level("error")
+    import main
+
+    return main
+
+
+def warm_dashboard():
+    """Load the datasets and the catalog and compute the global KPIs
+
+    Returns (data version, faculties, seconds).
+    """
+    main = _load_app()
+
+    import catalog
+    import metrics
+
+    started = time.perf_counter()
+    data = main.DataManager.get_data()
+    catalog.get()
+    metrics.kpis(data)
+    faculties = main.DataManager.get_faculties()
+    return data["version"], faculties, time.perf_counter() - started
+
+
+def warm_cards(faculties):
+    """Build the gallery cards of the main dashboard; return how many"""
+    main = _load_app()
+
+    assets.build_cards(
+        (faculty, main.DataManager.get_faculty_full_name(faculty))
+        for faculty in faculties
+    )
+    return len(faculties)
+
+
+def warm_faculty(faculty):
+    """Compute a faculty's aggregates and charts; return (faculty, values, seconds)"""
+    main = _load_app()
+
+    import cache
+
+    started = time.perf_counter()
+    jobs = main.FacultyDashboardView.cache_jobs(faculty)
+    for key, compute, family in jobs:
+        cache.get_or_compute(key, compute, family)
+    return faculty, len(jobs), time.perf_counter() - started
+
+
+def warm(workers=None):
+    """Run the warm-up and write READY_FILE; return its contents"""
+    READY_FILE.unlink(missing_ok=True)
+    started = time.perf_counter()
+
+    # The static charts render in their own process pool meanwhile
+    charts = subprocess.Popen(
+        [sys.executable, os.path.abspath(prerender.__file__)]
+        + (["--workers", str(workers)] if workers else []),
+        stdout=subprocess.DEVNULL,
+    )
+
+    assets.load_manifest()
+    assets.stylesheet_url()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        version, faculties, _ = pool.submit(warm_dashboard).result()
+        cards = pool.submit(warm_cards, faculties)
+        results = list(pool.map(warm_faculty, faculties))
+        cards.result()
+
+    if charts.wait() != 0:
+        raise RuntimeError("prerender.py falló")
+
+    ready = {
+        "version": version,
+        "faculties": len(faculties),
+        "values": sum(values for _, values, _ in results),
+        "charts": len(prerender.load_manifest()["charts"]),
+        "seconds": round(time.perf_counter() - started, 2),
+        "finished": datetime.now().isoformat(timespec="seconds"),
+    }
+    READY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = READY_FILE.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(ready, indent=2), encoding="utf-8")
+    os.replace(tmp_path, READY_FILE)
+    return ready
+
+
+def report(ready):
+    print(
+        f"✅ Listo en {ready['seconds']:.1f} s: {ready['faculties']} facultades, "
+        f"{ready['values']} valores en caché, {ready['charts']} gráficos "
+        f"({ready['version']}) → {READY_FILE}",
+        flush=True,
+    )
+
+
+def serve(workers=None, streamlit_args=()):
+    """Warm up, run the server, and warm up again whenever the data changes
+
+    Returns the server's exit code.
+    """
+    files = tuple(_load_app().DataManager.DATA_FILES.values())
+    # A stop request still runs the cleanup below
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    server = None
+    try:
+        stamp = reloader.file_stamp(files)
+        report(warm(workers))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", "main.py", *streamlit_args]
+        )
+        while server.poll() is None:
+            time.sleep(reloader.POLL_SECONDS)
+            current = reloader.file_stamp(files)
+            if current == stamp:
+                continue
+            # Out of rotation until the new version is warm
+            READY_FILE.unlink(missing_ok=True)
+            time.sleep(reloader.SETTLE_SECONDS)
+            if reloader.file_stamp(files) != current:
+                continue
+            stamp = current
+            try:
+                report(warm(workers))
+            except Exception as error:
+                # Keep serving, out of rotation, until the data is fixed
+                print(f"❌ Calentamiento fallido: {error}", flush=True)
+        return server.returncode
+    finally:
+        READY_FILE.unlink(missing_ok=True)
+        if server is not None and server.poll() is None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the caches before serving")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument(
+        "--serve", action="store_true", help="then run the app and keep it warm"
+    )
+    parser.add_argument(
+        "streamlit_args", nargs="*", help="options for streamlit run (after --)"
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.serve:
+            sys.exit(serve(args.workers, args.streamlit_args))
+        report(warm(workers=args.workers))
+    except Exception as error:
+        print(f"❌ Calentamiento fallido: {error}")
+        sys.exit(1)